@@ -3,142 +3,558 @@ MCTS Bot
 使用蒙特卡洛树搜索算法
 """
 
+import atexit
+import math
 import time
 import random
-import math
+import multiprocessing
+import numpy as np
+from collections import OrderedDict
 from typing import Dict, List, Tuple, Any, Optional
 from agents.base_agent import BaseAgent
+from agents.ai_bots.mcts_tree import NodePool
 import config
-import copy
-
-
-class MCTSNode:
-    """MCTS节点"""
-    
-    def __init__(self, state, parent=None, action=None):
-        self.state = state
-        self.parent = parent
-        self.action = action
-        self.children = []
-        self.visits = 0
-        self.value = 0.0
-        self.untried_actions = self._get_untried_actions()
-    
-    def _get_untried_actions(self):
-        """获取未尝试的动作"""
-        if hasattr(self.state, 'get_valid_actions'):
-            return self.state.get_valid_actions()
-        return []
-    
-    def is_fully_expanded(self):
-        """检查是否完全展开"""
-        return len(self.untried_actions) == 0
-    
-    def is_terminal(self):
-        """检查是否为终止节点"""
-        if hasattr(self.state, 'is_terminal'):
-            return self.state.is_terminal()
-        return False
-    
-    def get_winner(self):
-        """获取获胜者"""
-        if hasattr(self.state, 'get_winner'):
-            return self.state.get_winner()
-        return None
-    
-    def clone_state(self):
-        """克隆状态"""
-        if hasattr(self.state, 'clone'):
-            return self.state.clone()
-        return self.state
+
+
+# 根并行使用的常驻进程池，跨步、跨对局复用，避免每步重新创建进程和导入模块
+_worker_pool = None
+_worker_pool_size = 0
+
+# 根并行时转发给工作进程的搜索参数（MCTSBot的属性名）
+WORKER_SETTINGS = ('simulation_count', 'exploration_constant', 'use_candidates', 'rollout_batch',
+                   'rave', 'rave_schedule', 'rave_parameter', 'progressive_widening',
+                   'widening_constant', 'widening_exponent', 'leaf_evaluator', 'leaf_batch',
+                   'virtual_loss', 'max_rollout_depth')
+
+# 工作进程内每个搜索者保留一个MCTSBot，无论分到第几个任务都复用本进程上一步的搜索树；
+# 每个节点池可能很大，超出上限时丢弃最早的
+MAX_WORKER_BOTS = 4
+_worker_bots = OrderedDict()
+
+
+def get_worker_pool(num_workers: int):
+    """获取包含num_workers个进程的常驻进程池，数量变化时重建"""
+    global _worker_pool, _worker_pool_size
+    if _worker_pool is None or _worker_pool_size != num_workers:
+        shutdown_worker_pool()
+        _worker_pool = multiprocessing.Pool(num_workers)
+        _worker_pool_size = num_workers
+    return _worker_pool
+
+
+def shutdown_worker_pool():
+    """关闭常驻进程池"""
+    global _worker_pool, _worker_pool_size
+    if _worker_pool is not None:
+        _worker_pool.terminate()
+        _worker_pool.join()
+        _worker_pool = None
+        _worker_pool_size = 0
+
+
+atexit.register(shutdown_worker_pool)
+
+
+def _search_worker(task: Tuple) -> Tuple[Dict[Any, int], Dict[str, int]]:
+    """
+    工作进程中执行一次独立搜索
+
+    同一次合并中本进程可能先后分到同一搜索者的多个任务，它们在同一棵树上接着搜索，
+    因此只返回本任务新增的访问次数，合并时不会重复计入
+
+    Returns:
+        根节点各子节点本次新增的访问次数 {动作: 访问次数}，以及本次搜索的统计
+    """
+    key, game, player_id, settings, seed = task
+    bot = _worker_bots.get(key)
+    if bot is None:
+        bot = MCTSBot(player_id=player_id, num_workers=1)
+        _worker_bots[key] = bot
+        if len(_worker_bots) > MAX_WORKER_BOTS:
+            _worker_bots.popitem(last=False)
+    else:
+        _worker_bots.move_to_end(key)
+    for name in WORKER_SETTINGS:
+        setattr(bot, name, settings[name])
+    random.seed(seed)
+    # 主进程传来的是time.monotonic()的绝对截止时刻（各进程共用同一时钟），排队等待的时间也计入；
+    # 换算为本进程time.perf_counter()的时刻供搜索使用
+    deadline = settings['deadline']
+    if deadline is not None:
+        deadline = time.perf_counter() + (deadline - time.monotonic())
+    node = bot.pool.find(game.hash)
+    before = bot.pool.child_visits(node) if node >= 0 else {}
+    root = bot.search_root(game, deadline)
+    visits = {action: count - before.get(action, 0)
+              for action, count in bot.pool.child_visits(root).items() if count > before.get(action, 0)}
+    return visits, bot.last_search
 
 
 class MCTSBot(BaseAgent):
     """MCTS Bot"""
-    
-    def __init__(self, name: str = "MCTSBot", player_id: int = 1, 
-                 simulation_count: int = 100):
+
+    def __init__(self, name: str = "MCTSBot", player_id: int = 1,
+                 simulation_count: int = 100, use_candidates: bool = None,
+                 num_workers: int = None, timeout: float = None):
         super().__init__(name, player_id)
         self.simulation_count = simulation_count
-        
+
         # 从配置获取参数
         ai_config = config.AI_CONFIGS.get('mcts', {})
         self.simulation_count = ai_config.get('simulation_count', simulation_count)
-        self.timeout = ai_config.get('timeout', 10)
-    
+        self.exploration_constant = ai_config.get('exploration_constant', 1.414)
+        # 每步的时间上限（秒），达到模拟次数或时间上限即停止搜索；None表示不限时
+        if timeout is None:
+            timeout = ai_config.get('timeout', 10)
+        self.timeout = timeout
+        if use_candidates is None:
+            use_candidates = ai_config.get('use_candidates', True)
+        self.use_candidates = use_candidates
+        # 根并行的进程数，每个进程独立搜索simulation_count次，合并根节点访问次数后选择动作
+        if num_workers is None:
+            num_workers = ai_config.get('num_workers', 1)
+        self.num_workers = max(1, num_workers)
+        # 每个叶节点的模拟盘数，大于1时用游戏的批量模拟器同时随机对弈，以平均结果回传
+        self.rollout_batch = max(1, ai_config.get('rollout_batch', 1))
+        # 每盘模拟最多走的步数，达到时按平局计；None表示不限（游戏必须保证会结束）
+        self.max_rollout_depth = ai_config.get('max_rollout_depth', 500)
+        # RAVE：按AMAF统计选择子节点，权重随子节点访问次数按rave_schedule衰减
+        self.rave = ai_config.get('rave', False)
+        self.rave_schedule = ai_config.get('rave_schedule', 'equivalence')
+        if self.rave_schedule not in ('equivalence', 'mse'):
+            raise ValueError(f"未知的RAVE权重方案: {self.rave_schedule}")
+        self.rave_parameter = (ai_config.get('rave_equivalence', 1000) if self.rave_schedule == 'equivalence'
+                               else ai_config.get('rave_bias', 0.1))
+        # 渐进展开：子边按game.get_action_priors从高到低排列，访问N次的节点只考虑前ceil(C·N^α)条
+        self.progressive_widening = ai_config.get('progressive_widening', False)
+        self.widening_constant = ai_config.get('widening_constant', 2.0)
+        self.widening_exponent = ai_config.get('widening_exponent', 0.5)
+        # 局面评估器：非终局叶节点不做随机模拟，攒够leaf_batch个后由game.evaluate_leaf_states一次评估；
+        # 等待评估的路径先记virtual_loss次失败访问，使同一批的后续选择走向其他分支
+        self.leaf_evaluator = ai_config.get('leaf_evaluator', False)
+        self.leaf_batch = max(1, ai_config.get('leaf_batch', 16))
+        self.virtual_loss = ai_config.get('virtual_loss', 1)
+
+        # 节点池跨步保留，对手应手后的局面若已在池中即直接复用其统计；
+        # 内存按max_tree_bytes预分配，按edges_per_node在节点和边之间划分
+        self.max_tree_bytes = ai_config.get('max_tree_bytes', 256 * 1024 * 1024)
+        self.pool = NodePool.from_budget(self.max_tree_bytes, ai_config.get('edges_per_node', 8))
+        self._root = None
+        self.last_search = {}
+        # 根并行时各进程的随机种子由此生成，工作进程按key区分不同的搜索者
+        self._seed_rng = random.Random()
+        self._worker_key = (id(self), self._seed_rng.getrandbits(32))
+
     def get_action(self, observation: Any, env: Any) -> Any:
         """
         使用MCTS选择动作
-        
+
         Args:
             observation: 当前观察
             env: 环境对象
-            
+
         Returns:
             选择的动作
         """
         start_time = time.time()
-        
+        deadline = None if self.timeout is None else time.perf_counter() + self.timeout
+
         # 获取有效动作
         valid_actions = env.get_valid_actions()
-        
+
         if not valid_actions:
             return None
-        
-        best_action = valid_actions[0]
-        best_score = -float('inf')
-        
-        simulations_per_action = max(1, self.simulation_count // len(valid_actions))
-        
-        for action in valid_actions:
-            score = 0
-            for _ in range(simulations_per_action):
-                score += self.simulate(env.game.clone(), action)
-            avg_score = score / simulations_per_action
-            
-            if avg_score > best_score:
-                best_score = avg_score
-                best_action = action
-        
+
+        # 所有模拟共用一份局面副本，每次模拟结束后撤销回根局面
+        game = env.game.clone()
+        if self.num_workers > 1:
+            visits = self._parallel_search(game, deadline)
+        else:
+            root = self.search_root(game, deadline)
+            visits = self.pool.child_visits(root)
+
+        # 同时移动时树中的边是联合动作，按己方方向合并访问次数，只返回己方方向
+        if getattr(game, 'simultaneous', False):
+            own_visits = {}
+            for action, count in visits.items():
+                own = action[self.player_id - 1]
+                own_visits[own] = own_visits.get(own, 0) + count
+            visits = own_visits
+            valid_actions = game.get_valid_actions(self.player_id)
+
+        if visits:
+            best_action = max(visits, key=visits.get)
+        else:
+            best_action = random.choice(valid_actions)
+
         # 更新统计
         move_time = time.time() - start_time
         self.total_moves += 1
         self.total_time += move_time
-        
+
         return best_action
-    
-    def simulate(self, game, first_action):
-        # 执行第一个动作
-        game.step(first_action)
-        
-        # 随机模拟到游戏结束
+
+    def search_root(self, game, deadline: float = None) -> int:
+        """
+        复用或新建根节点并搜索，返回根节点编号，搜索树保留到下一步
+
+        搜索在完成simulation_count次模拟或到达deadline（time.perf_counter时刻）时停止，
+        统计写入last_search
+        """
+        start = time.perf_counter()
+        evictions = self.pool.evictions
+        root = self._get_root(game)
+        reused_visits = int(self.pool.visits[root])
+        root, iterations, nodes, depth, transpositions = self.search(
+            game, root, self.simulation_count, deadline)
+        self._root = root
+        self.last_search = {
+            'iterations': iterations,
+            'nodes': nodes,
+            'depth': depth,
+            'transpositions': transpositions,
+            'evictions': self.pool.evictions - evictions,
+            'tree_nodes': len(self.pool),
+            'workers': 1,
+            'root_visits': int(self.pool.visits[root]),
+            'reused_visits': reused_visits,
+            'time': time.perf_counter() - start,
+        }
+        return root
+
+    def _parallel_search(self, game, deadline: float = None) -> Dict[Any, int]:
+        """
+        根并行：各工作进程以不同的随机种子从同一局面独立搜索，合并根节点各动作本步新增的访问次数
+
+        工作进程按搜索者（而不是任务序号）保留搜索树，任务分到哪个进程都复用该进程上一步的树
+
+        Returns:
+            合并后的 {动作: 访问次数}
+        """
+        start = time.perf_counter()
+        settings = {name: getattr(self, name) for name in WORKER_SETTINGS}
+        # 同一进程可能先后执行多个任务，因此传绝对截止时刻而不是剩余时间
+        settings['deadline'] = None if deadline is None else time.monotonic() + (deadline - start)
+        tasks = [(self._worker_key, game, self.player_id, settings, self._seed_rng.getrandbits(64))
+                 for i in range(self.num_workers)]
+        visits = {}
+        merged = {'iterations': 0, 'nodes': 0, 'depth': 0, 'transpositions': 0, 'evictions': 0,
+                  'tree_nodes': 0, 'workers': self.num_workers, 'root_visits': 0, 'reused_visits': 0}
+        for worker_visits, stats in get_worker_pool(self.num_workers).map(_search_worker, tasks, chunksize=1):
+            for action, count in worker_visits.items():
+                visits[action] = visits.get(action, 0) + count
+            for key in ('iterations', 'nodes', 'transpositions', 'evictions', 'tree_nodes',
+                        'root_visits', 'reused_visits'):
+                merged[key] += stats[key]
+            merged['depth'] = max(merged['depth'], stats['depth'])
+        merged['time'] = time.perf_counter() - start
+        self.last_search = merged
+        return visits
+
+    def search(self, game, root: int, simulations: int,
+               deadline: float = None) -> Tuple[int, int, int, int, int]:
+        """
+        从根局面执行选择-扩展-模拟-回传，结束后game回到根局面
+
+        节点不保存局面，每次模拟从根局面沿路径apply动作重新得到，回传后再undo；
+        使用局面评估器时叶节点先存入待评估批次，批次满、节点池压缩前和搜索结束时统一评估并回传；
+        同时移动的游戏按解耦UCT选择子节点（见_decoupled_select），不使用RAVE
+
+        Args:
+            root: 根节点编号
+            simulations: 模拟次数上限
+            deadline: 截止时刻（time.perf_counter），每次模拟前和模拟的每一步检查，None表示不限时
+
+        Returns:
+            (根节点编号（节点池压缩后会变化）, 完成的模拟次数, 新建的节点数,
+             树中到达的最大深度, 扩展时命中置换局面的次数)
+        """
+        pool = self.pool
+        nodes = 0
+        max_depth = 0
+        transpositions = 0
+        # 等待批量评估的叶节点 (路径, 走子, 叶节点走子方, 局面快照)
+        pending = []
+        simultaneous = getattr(game, 'simultaneous', False)
+        rave = self.rave and not simultaneous
+        for iteration in range(simulations):
+            if deadline is not None and time.perf_counter() >= deadline:
+                self._evaluate_pending(game, pending)
+                return root, iteration, nodes, max_depth, transpositions
+            if not pool.has_room():
+                # 压缩会改变节点编号，先回传待评估的路径
+                self._evaluate_pending(game, pending)
+                root = pool.collect(root)
+            node = root
+            path = [root]
+            seen = {root}
+            depth = 0
+            # 本次模拟的走子 (玩家, 动作编号)，供RAVE更新
+            moves = [] if rave else None
+
+            # 选择与扩展：节点还有未尝试的动作时扩展一个，否则沿UCT值最大的子节点下行；
+            # 使用RAVE时在全部子边中按RAVE值选择，选中未扩展的边即为扩展。
+            # 渐进展开时"全部"只指按访问次数放开的前width条边。
+            # 到达新建（或被淘汰后重建）的节点、置换局面或回到本路径上的局面时停止
+            while not game.is_terminal():
+                if pool.num_children[node] < 0 and not self._add_children(game, node):
+                    break
+                if pool.num_children[node] == 0:
+                    break
+                width = self._widening(node)
+                if rave:
+                    edge = pool.rave_select(node, self.exploration_constant,
+                                            self.rave_schedule, self.rave_parameter, width)
+                    expanding = pool.edge_child[edge] < 0
+                    moves.append((game.current_player, int(pool.edge_action[edge])))
+                else:
+                    expanded = int(pool.num_expanded[node])
+                    expanding = expanded < pool.num_children[node] and (width is None or expanded < width)
+                    if expanding:
+                        edge = int(pool.first_child[node]) + expanded
+                        pool.num_expanded[node] = expanded + 1
+                    elif simultaneous:
+                        edge = self._decoupled_select(node)
+                    else:
+                        edge = pool.uct_select(node, self.exploration_constant)
+                node, created = self._child(game, node, edge)
+                depth += 1
+                if node in seen:
+                    break
+                seen.add(node)
+                path.append(node)
+                if created:
+                    nodes += 1
+                    break
+                if expanding:
+                    transpositions += 1
+                    break
+            max_depth = max(max_depth, depth)
+
+            # 模拟（或等待评估）与回传
+            leaf_player = game.current_player
+            if self.leaf_evaluator and not game.is_terminal():
+                pool.visits[path] += self.virtual_loss
+                pending.append((path, moves, leaf_player, game.get_leaf_state()))
+                if len(pending) >= self.leaf_batch:
+                    self._evaluate_pending(game, pending)
+            else:
+                results = self.rollout(game, moves, deadline)
+                pool.update(path, results)
+                if moves is not None:
+                    self._update_rave(path, moves, leaf_player, results)
+
+            for _ in range(depth):
+                game.undo()
+        self._evaluate_pending(game, pending)
+        return root, simulations, nodes, max_depth, transpositions
+
+    def _evaluate_pending(self, game, pending: List[Tuple]):
+        """一次评估批次中的全部叶节点，撤去虚拟失败后沿各自路径回传，并清空批次"""
+        if not pending:
+            return
+        values = game.evaluate_leaf_states([state for _, _, _, state in pending])
+        for (path, moves, leaf_player, _), results in zip(pending, values):
+            self.pool.visits[path] -= self.virtual_loss
+            self.pool.update(path, results)
+            if moves is not None:
+                self._update_rave(path, moves, leaf_player, results)
+        pending.clear()
+
+    def _decoupled_select(self, node: int) -> int:
+        """
+        同时移动的节点按解耦UCT选择一条已扩展的子边，子节点已被淘汰的边优先；返回边编号
+
+        子节点统计记在玩家1名下，双方得分之和为1，玩家2的累计得分即访问次数减去玩家1的。
+        玩家1按本方方向的边际统计（合并同一方向的各联合动作）以UCT选出方向，
+        玩家2再在含该方向的边中按自己方向的边际统计选择
+        """
+        pool = self.pool
+        first = int(pool.first_child[node])
+        edges = np.arange(first, first + int(pool.num_expanded[node]))
+        children = pool.edge_child[edges]
+        missing = np.flatnonzero(children < 0)
+        if missing.size:
+            return int(edges[missing[0]])
+        joint = [pool.actions[action] for action in pool.edge_action[edges].tolist()]
+        visits = pool.visits[children].tolist()
+        value = pool.value[children].tolist()
+        log_visits = math.log(max(int(pool.visits[node]), 1))
+
+        candidates = list(range(len(joint)))
+        for index in (0, 1):
+            stats = {}
+            for action, count, score in zip(joint, visits, value):
+                total = stats.setdefault(action[index], [0, 0.0])
+                total[0] += count
+                total[1] += score if index == 0 else count - score
+
+            def uct(i):
+                count, score = stats[joint[i][index]]
+                count = max(count, 1)
+                return score / count + self.exploration_constant * math.sqrt(log_visits / count)
+
+            best = joint[max(candidates, key=uct)][index]
+            candidates = [i for i in candidates if joint[i][index] == best]
+        return int(edges[candidates[0]])
+
+    def _widening(self, node: int) -> Optional[int]:
+        """节点当前可考虑的子边数，未启用渐进展开时为None（不限）"""
+        if not self.progressive_widening:
+            return None
+        visits = max(int(self.pool.visits[node]), 1)
+        return max(1, math.ceil(self.widening_constant * visits ** self.widening_exponent))
+
+    def _add_children(self, game, node: int) -> bool:
+        """
+        为节点生成子边，边数组空间不足时返回False（本次模拟不再下行）
+
+        子边顺序随机；渐进展开时再按先验从高到低稳定排序，先验相同的动作仍为随机顺序
+        """
+        actions = self._get_search_actions(game)
+        random.shuffle(actions)
+        if self.progressive_widening and len(actions) > 1:
+            priors = game.get_action_priors(actions)
+            actions = [actions[i] for i in np.argsort(-priors, kind='stable')]
+        return self.pool.add_children(node, [self.pool.action_id(action) for action in actions])
+
+    def _child(self, game, node: int, edge: int) -> Tuple[int, bool]:
+        """
+        沿边执行动作进入子局面，返回子节点编号以及是否新建
+
+        子局面不在节点池中（首次到达或已被淘汰）时新建节点
+        """
+        pool = self.pool
+        player = game.current_player
+        game.apply(pool.actions[pool.edge_action[edge]])
+        child_hash = game.hash
+        child = pool.find(child_hash)
+        created = child < 0
+        if created:
+            child = pool.new_node(child_hash, player, node)
+        pool.edge_child[edge] = child
+        return child, created
+
+    def _update_rave(self, path: List[int], moves: List[Tuple[int, int]], leaf_player: int,
+                     results: np.ndarray):
+        """
+        与回传同一轮更新路径上各节点的AMAF统计
+
+        路径上第i个节点之后的走子为moves[i:]（树中走子在前、模拟走子在后），
+        其中由该节点走子方走出的动作都视为在该节点首先走出
+        """
+        for i, node in enumerate(path):
+            if i < len(moves):
+                player = moves[i][0]
+            elif i == len(moves):
+                player = leaf_player
+            else:
+                break
+            played = [action for mover, action in moves[i:] if mover == player]
+            self.pool.update_rave(node, np.array(played, dtype=np.int64), results[player])
+
+    def rollout(self, game, moves: List[Tuple[int, int]] = None, deadline: float = None) -> np.ndarray:
+        """
+        从当前局面随机模拟到终局，局面保持不变
+
+        走满max_rollout_depth步或到达deadline时停止，未结束的模拟按平局计
+
+        Args:
+            moves: 不为None时逐盘模拟的走子以 (玩家, 动作编号) 追加到其中；
+                   批量模拟不记录走子
+            deadline: 截止时刻（time.perf_counter），None表示不限时
+
+        Returns:
+            按玩家编号索引的平均得分（胜1、平0.5、负0）
+        """
+        if self.rollout_batch > 1:
+            winners = game.random_playouts(self.rollout_batch, random.getrandbits(32),
+                                           self.max_rollout_depth, deadline)
+        else:
+            winners = np.array([self._rollout_one(game, moves, deadline) or 0])
+        results = np.bincount(winners, minlength=game.num_players + 1) / len(winners)
+        # 平局双方各得0.5
+        results[1:] += results[0] * 0.5
+        return results
+
+    def _rollout_one(self, game, moves: List[Tuple[int, int]] = None,
+                     deadline: float = None) -> Optional[int]:
+        """
+        逐步随机模拟一盘到终局，返回获胜者，结束后把game撤销回原局面
+
+        走满max_rollout_depth步或到达deadline时提前停止，返回None（平局）
+        """
+        depth = 0
+        max_depth = self.max_rollout_depth
         while not game.is_terminal():
-            valid_actions = game.get_valid_actions()
+            if max_depth is not None and depth >= max_depth:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            valid_actions = self._get_search_actions(game)
             if not valid_actions:
                 break
             action = random.choice(valid_actions)
-            game.step(action)
-        
-        # 返回结果评分
+            if moves is not None:
+                moves.append((game.current_player, self.pool.action_id(action)))
+            game.apply(action)
+            depth += 1
+
         winner = game.get_winner()
-        if winner == self.player_id:
-            return 1
-        elif winner is not None:
-            return -1
-        else:
-            return 0
-    
+        for _ in range(depth):
+            game.undo()
+        return winner
+
+    def _get_root(self, game) -> int:
+        """
+        取当前局面在节点池中的节点作为根，不在池中时新建
+
+        上一步搜索过对手应手后的局面时，其统计直接得到复用
+        """
+        root = self.pool.find(game.hash)
+        if root < 0:
+            if len(self.pool) >= self.pool.max_nodes:
+                # 节点池已满时先按上一步的根节点回收空间，当前局面通常是其孙节点
+                if self._root is not None:
+                    self.pool.collect(self._root)
+                    root = self.pool.find(game.hash)
+                if root < 0 and len(self.pool) >= self.pool.max_nodes:
+                    self.pool.clear()
+            if root < 0:
+                root = self.pool.new_node(game.hash, 0)
+        return root
+
+    def _get_search_actions(self, game):
+        """获取搜索和模拟时使用的动作"""
+        if self.use_candidates:
+            return game.get_candidate_actions()
+        return game.get_valid_actions()
+
     def reset(self):
         """重置MCTS Bot"""
         super().reset()
-    
+        self.pool.clear()
+        self._root = None
+        self.last_search = {}
+        # 换用新的key，工作进程中旧的搜索树不再被使用
+        self._worker_key = (id(self), self._seed_rng.getrandbits(32))
+
     def get_info(self) -> Dict[str, Any]:
         """获取MCTS Bot信息"""
         info = super().get_info()
         info.update({
             'type': 'MCTS',
             'description': '使用蒙特卡洛树搜索的Bot',
-            'strategy': f'MCTS with {self.simulation_count} simulations',
-            'timeout': self.timeout
+            'strategy': (f'UCT with {self.simulation_count} simulations x {self.num_workers} workers, '
+                         f'c={self.exploration_constant}'),
+            'progressive_widening': self.progressive_widening,
+            'timeout': self.timeout,
+            'tree_nodes': len(self.pool),
+            'tree_edges': self.pool.num_edges,
+            'max_nodes': self.pool.max_nodes,
+            'max_edges': self.pool.max_edges,
+            'max_tree_bytes': self.max_tree_bytes,
+            'tree_memory_bytes': self.pool.memory_usage(),
+            'last_search': dict(self.last_search)
         })
-        return info 
\ No newline at end of file
+        return info
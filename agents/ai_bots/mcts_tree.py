@@ -0,0 +1,328 @@
+"""
+MCTS节点池
+节点统计存放在预分配的numpy并行数组中，节点以整数下标表示，不为每个节点创建Python对象。
+同一局面（局面哈希相同）只对应一个节点，经开放寻址的哈希索引查找，搜索树实际为有向无环图
+"""
+
+from typing import Any, Dict, List
+import numpy as np
+
+
+def _ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """把若干区间 [starts[i], starts[i] + counts[i]) 拼接为一个下标数组"""
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.cumsum(counts) - counts
+    return np.repeat(starts - offsets, counts) + np.arange(total)
+
+
+class NodePool:
+    """
+    数组实现的MCTS节点池
+
+    节点数组（下标为节点编号）：
+        visits / value: 访问次数，以及从走入该节点的玩家（player）视角累计的结果
+        player: 走入该节点的玩家，根节点为0
+        hash: 局面哈希
+        parent: 创建该节点时的父节点（置换局面可能有多个父节点，只记录第一个），-1表示无
+        first_child / num_children: 子边在边数组中的连续区间，num_children为-1表示尚未生成
+        num_expanded: 区间中已尝试过的边数，边按生成时的顺序（随机或按先验从高到低）扩展
+
+    边数组：
+        edge_action: 动作编号（见 action_id）
+        edge_child: 子节点编号，尚未扩展或子节点已被淘汰时为-1
+        rave_visits / rave_value: 该动作的AMAF统计，即节点之后同一玩家在模拟中任意时刻
+                                  走过该动作的次数，以及这些模拟中该玩家的累计得分
+
+    节点和边都从数组头部顺序分配；节点数或边数达到上限时由 collect 淘汰节点并压缩数组
+    """
+
+    # 未指定边数上限时，边数上限与节点容量之比
+    EDGES_PER_NODE = 4
+    # 每个节点占用的字节数上限：节点数组37字节，加上哈希索引（槽位数不超过节点容量的4倍）16字节
+    NODE_BYTES = 53
+    # 每条边占用的字节数
+    EDGE_BYTES = 20
+
+    def __init__(self, max_nodes: int, max_edges: int = None):
+        if max_nodes < 2:
+            raise ValueError(f"节点池容量至少为2: {max_nodes}")
+        self.max_nodes = max_nodes
+        self.max_edges = max_nodes * self.EDGES_PER_NODE if max_edges is None else max_edges
+
+        # 节点和边数组按需写入，np.empty不会立即占用物理内存
+        self.visits = np.empty(max_nodes, dtype=np.int32)
+        self.value = np.empty(max_nodes, dtype=np.float64)
+        self.player = np.empty(max_nodes, dtype=np.int8)
+        self.hash = np.empty(max_nodes, dtype=np.uint64)
+        self.parent = np.empty(max_nodes, dtype=np.int32)
+        self.first_child = np.empty(max_nodes, dtype=np.int32)
+        self.num_children = np.empty(max_nodes, dtype=np.int32)
+        self.num_expanded = np.empty(max_nodes, dtype=np.int32)
+        self.edge_action = np.empty(self.max_edges, dtype=np.int32)
+        self.edge_child = np.empty(self.max_edges, dtype=np.int32)
+        self.rave_visits = np.empty(self.max_edges, dtype=np.int32)
+        self.rave_value = np.empty(self.max_edges, dtype=np.float64)
+
+        # 哈希索引：线性探测的开放寻址表，槽位数为2的幂且不少于节点容量的两倍
+        table_size = 1 << (2 * max_nodes - 1).bit_length()
+        self._mask = table_size - 1
+        self._slots = np.full(table_size, -1, dtype=np.int32)
+
+        # 动作与编号的双向映射，跨局保留
+        self.actions = []
+        self._action_ids = {}
+
+        self.num_nodes = 0
+        self.num_edges = 0
+        self.max_block = 0
+        self.evictions = 0
+        self.collections = 0
+
+    @classmethod
+    def from_budget(cls, max_bytes: int, edges_per_node: float) -> 'NodePool':
+        """
+        按内存上限创建节点池，memory_usage()不超过max_bytes
+
+        Args:
+            max_bytes: 节点数组、边数组和哈希索引合计的字节数上限
+            edges_per_node: 边数上限与节点容量之比，宜取搜索中每个节点平均生成的子边数
+        """
+        max_nodes = int(max_bytes // (cls.NODE_BYTES + edges_per_node * cls.EDGE_BYTES))
+        return cls(max_nodes, int(max_nodes * edges_per_node))
+
+    def __len__(self) -> int:
+        return self.num_nodes
+
+    def action_id(self, action: Any) -> int:
+        """动作的编号，首次出现时分配"""
+        index = self._action_ids.get(action)
+        if index is None:
+            index = len(self.actions)
+            self._action_ids[action] = index
+            self.actions.append(action)
+        return index
+
+    def find(self, hash: int) -> int:
+        """按局面哈希查找节点，不存在时返回-1"""
+        mask = self._mask
+        slot = hash & mask
+        while True:
+            node = int(self._slots[slot])
+            if node < 0 or self.hash[node] == hash:
+                return node
+            slot = (slot + 1) & mask
+
+    def new_node(self, hash: int, player: int, parent: int = -1) -> int:
+        """分配节点并加入哈希索引，节点池已满时返回-1"""
+        if self.num_nodes >= self.max_nodes:
+            return -1
+        node = self.num_nodes
+        self.num_nodes += 1
+        self.visits[node] = 0
+        self.value[node] = 0.0
+        self.player[node] = player
+        self.hash[node] = hash
+        self.parent[node] = parent
+        self.first_child[node] = -1
+        self.num_children[node] = -1
+        self.num_expanded[node] = 0
+
+        mask = self._mask
+        slot = hash & mask
+        while self._slots[slot] >= 0:
+            slot = (slot + 1) & mask
+        self._slots[slot] = node
+        return node
+
+    def add_children(self, node: int, action_ids: List[int]) -> bool:
+        """为节点生成子边（尚未扩展），边数达到上限时返回False"""
+        count = len(action_ids)
+        if self.num_edges + count > self.max_edges:
+            return False
+        first = self.num_edges
+        self.num_edges += count
+        self.edge_action[first:first + count] = action_ids
+        self.edge_child[first:first + count] = -1
+        self.rave_visits[first:first + count] = 0
+        self.rave_value[first:first + count] = 0.0
+        self.first_child[node] = first
+        self.num_children[node] = count
+        self.num_expanded[node] = 0
+        self.max_block = max(self.max_block, count)
+        return True
+
+    def uct_select(self, node: int, exploration_constant: float) -> int:
+        """按UCT公式在已扩展的子边中选择一条，子节点已被淘汰的边优先；返回边编号"""
+        first = int(self.first_child[node])
+        children = self.edge_child[first:first + int(self.num_expanded[node])]
+        missing = np.flatnonzero(children < 0)
+        if missing.size:
+            return first + int(missing[0])
+        visits = np.maximum(self.visits[children], 1)
+        log_visits = np.log(max(int(self.visits[node]), 1))
+        scores = (self.value[children] / visits +
+                  exploration_constant * np.sqrt(log_visits / visits))
+        return first + int(np.argmax(scores))
+
+    def rave_select(self, node: int, exploration_constant: float, schedule: str,
+                    parameter: float, limit: int = None) -> int:
+        """
+        按RAVE值在子边（含未扩展的）中选择一条，返回边编号；limit不为None时只考虑区间中的前limit条
+
+        得分为 (1-β)·Q + β·Q̃ + c·sqrt(ln N / (n+1))，Q̃为AMAF均值（尚无AMAF统计时取1，优先尝试）。
+        β随子节点访问次数n减小：
+            'equivalence': β = sqrt(k / (3n + k))，parameter为k
+            'mse': β = ñ / (n + ñ + 4b²nñ)，parameter为b，ñ为AMAF访问次数
+        """
+        first = int(self.first_child[node])
+        count = int(self.num_children[node])
+        if limit is not None:
+            count = min(count, limit)
+        edges = slice(first, first + count)
+        children = self.edge_child[edges]
+        present = children >= 0
+        visits = np.where(present, self.visits[np.maximum(children, 0)], 0)
+        value = np.where(present, self.value[np.maximum(children, 0)], 0.0)
+        rave_visits = self.rave_visits[edges]
+        rave_q = np.where(rave_visits > 0, self.rave_value[edges] / np.maximum(rave_visits, 1), 1.0)
+        q = value / np.maximum(visits, 1)
+        if schedule == 'equivalence':
+            beta = np.sqrt(parameter / (3 * visits + parameter))
+        else:
+            beta = rave_visits / (visits + rave_visits + 4 * parameter ** 2 * visits * rave_visits + 1e-9)
+        beta = np.where(visits > 0, beta, 1.0)
+        log_visits = np.log(max(int(self.visits[node]), 1))
+        scores = ((1 - beta) * q + beta * rave_q +
+                  exploration_constant * np.sqrt(log_visits / (visits + 1)))
+        return first + int(np.argmax(scores))
+
+    def update_rave(self, node: int, action_ids: np.ndarray, score: float):
+        """节点之后其走子方走过action_ids中的动作，按该玩家的得分更新对应子边的AMAF统计"""
+        count = int(self.num_children[node])
+        if count <= 0 or len(action_ids) == 0:
+            return
+        first = int(self.first_child[node])
+        edges = first + np.flatnonzero(np.isin(self.edge_action[first:first + count], action_ids))
+        self.rave_visits[edges] += 1
+        self.rave_value[edges] += score
+
+    def update(self, path: List[int], results: np.ndarray):
+        """
+        沿路径回传一次模拟的结果（路径上的节点互不相同）
+
+        Args:
+            results: 按玩家编号索引的得分，results[p]为玩家p的得分（胜1、平0.5、负0），
+                     results[0]对应根节点，不参与选择
+        """
+        nodes = np.array(path, dtype=np.int64)
+        self.visits[nodes] += 1
+        self.value[nodes] += results[self.player[nodes]]
+
+    def child_visits(self, node: int) -> Dict[Any, int]:
+        """节点各动作对应子节点的访问次数，未扩展或已被淘汰的子节点不计入"""
+        if self.num_children[node] <= 0:
+            return {}
+        first = int(self.first_child[node])
+        edges = np.arange(first, first + int(self.num_children[node]))
+        edges = edges[self.edge_child[edges] >= 0]
+        visits = self.visits[self.edge_child[edges]]
+        return {self.actions[action]: int(count)
+                for action, count in zip(self.edge_action[edges].tolist(), visits.tolist())}
+
+    def has_room(self) -> bool:
+        """是否还能完成一次模拟：至多新建一个节点、生成一段子边"""
+        return (self.num_nodes < self.max_nodes and
+                self.num_edges + self.max_block <= self.max_edges)
+
+    def collect(self, root: int, keep_fraction: float = 0.5) -> int:
+        """
+        淘汰节点并压缩数组，返回根节点的新编号
+
+        先按访问次数从多到少保留节点（根节点总是保留），直到节点或边的用量达到
+        容量的keep_fraction；再丢弃从根节点出发不可达的节点。
+        指向被淘汰节点的边置为-1，再次经过时重新创建子节点
+        """
+        count = self.num_nodes
+        priority = self.visits[:count].astype(np.int64)
+        priority[root] = np.iinfo(np.int64).max
+        order = np.argsort(-priority, kind='stable')
+        blocks = np.maximum(self.num_children[:count], 0)[order]
+        fits = ((np.arange(1, count + 1) <= self.max_nodes * keep_fraction) &
+                (np.cumsum(blocks) <= self.max_edges * keep_fraction))
+        fits[0] = True
+        keep = np.zeros(count, dtype=bool)
+        keep[order[:np.argmin(fits) if not fits.all() else count]] = True
+
+        # 从根节点沿已扩展的边做广度优先搜索
+        reachable = np.zeros(count, dtype=bool)
+        reachable[root] = True
+        frontier = np.array([root])
+        while frontier.size:
+            frontier = frontier[self.num_children[frontier] > 0]
+            edges = _ranges(self.first_child[frontier].astype(np.int64),
+                            self.num_children[frontier].astype(np.int64))
+            children = self.edge_child[edges]
+            children = children[children >= 0]
+            children = np.unique(children[keep[children] & ~reachable[children]])
+            reachable[children] = True
+            frontier = children
+        self._compact(np.flatnonzero(reachable))
+        self.evictions += count - self.num_nodes
+        self.collections += 1
+        return int(np.searchsorted(np.flatnonzero(reachable), root))
+
+    def _compact(self, kept: np.ndarray):
+        """只保留kept（升序）中的节点，重新编号并重建边数组和哈希索引"""
+        count = len(kept)
+        new_index = np.full(self.num_nodes, -1, dtype=np.int32)
+        new_index[kept] = np.arange(count, dtype=np.int32)
+
+        blocks = np.maximum(self.num_children[kept], 0).astype(np.int64)
+        edges = _ranges(self.first_child[kept].astype(np.int64), blocks)
+        edge_child = self.edge_child[edges]
+        edge_child = np.where(edge_child >= 0, new_index[np.maximum(edge_child, 0)], -1)
+        self.edge_child[:len(edges)] = edge_child
+        for array in (self.edge_action, self.rave_visits, self.rave_value):
+            array[:len(edges)] = array[edges]
+        self.num_edges = len(edges)
+
+        first_child = np.where(self.num_children[kept] >= 0, np.cumsum(blocks) - blocks, -1)
+        parent = self.parent[kept]
+        parent = np.where(parent >= 0, new_index[np.maximum(parent, 0)], -1)
+        for array in (self.visits, self.value, self.player, self.hash,
+                      self.num_children, self.num_expanded):
+            array[:count] = array[kept]
+        self.first_child[:count] = first_child
+        self.parent[:count] = parent
+        self.num_nodes = count
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        """批量重建哈希索引，每轮放入槽位空闲的节点（同一槽位只放一个），其余探测下一个槽位"""
+        self._slots.fill(-1)
+        pending = np.arange(self.num_nodes)
+        slots = (self.hash[:self.num_nodes] & np.uint64(self._mask)).astype(np.int64)
+        while pending.size:
+            free = np.flatnonzero(self._slots[slots] < 0)
+            targets, first = np.unique(slots[free], return_index=True)
+            self._slots[targets] = pending[free[first]]
+            placed = np.zeros(pending.size, dtype=bool)
+            placed[free[first]] = True
+            pending = pending[~placed]
+            slots = (slots[~placed] + 1) & self._mask
+
+    def clear(self):
+        """清空全部节点，保留动作编号"""
+        self._slots.fill(-1)
+        self.num_nodes = 0
+        self.num_edges = 0
+        self.max_block = 0
+
+    def memory_usage(self) -> int:
+        """节点池预分配的数组内存（字节），不含动作编号表"""
+        arrays = (self.visits, self.value, self.player, self.hash, self.parent, self.first_child,
+                  self.num_children, self.num_expanded, self.edge_action, self.edge_child,
+                  self.rave_visits, self.rave_value, self._slots)
+        return sum(array.nbytes for array in arrays)
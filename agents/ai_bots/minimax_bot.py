@@ -1,26 +1,84 @@
+import time
 from agents.base_agent import BaseAgent
-import copy
+import config
+
+
+class SearchTimeout(Exception):
+    """搜索超过本步的时间上限"""
+    pass
+
 
 class MinimaxBot(BaseAgent):
-    def __init__(self, name="MinimaxBot", player_id=1, max_depth=2):
+    def __init__(self, name="MinimaxBot", player_id=1, max_depth=2, use_candidates=True, timeout=None):
         super().__init__(name, player_id)
         self.max_depth = max_depth
+        # 只搜索游戏提供的候选动作（五子棋为棋子附近的空格）
+        self.use_candidates = use_candidates
+        # 每步的时间上限（秒），迭代加深到max_depth或超时为止；None表示不限时
+        if timeout is None:
+            timeout = config.AI_CONFIGS.get('minimax', {}).get('evaluation_timeout')
+        self.timeout = timeout
+        self.last_search = {}
+        self._deadline = None
+        self._nodes = 0
 
     def get_action(self, observation, env):
         valid_actions = env.get_valid_actions()
         if not valid_actions:
             return None
-            
+        
+        start_time = time.time()
+        self._deadline = None if self.timeout is None else time.perf_counter() + self.timeout
+        self._nodes = 0
+        
+        # 只克隆一次，之后在同一局面上用apply/undo原地搜索
+        game = env.game.clone()
+        if self.use_candidates:
+            valid_actions = game.get_candidate_actions()
+        else:
+            valid_actions = list(valid_actions)
+        # 同时移动时搜索联合动作，只返回己方方向
+        simultaneous = getattr(game, 'simultaneous', False)
+        best_action = valid_actions[0][self.player_id - 1] if simultaneous else valid_actions[0]
+        
+        # 迭代加深：逐层加深搜索，超时则放弃未完成的一层，返回最深完成层的最佳动作
+        completed_depth = 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                if simultaneous:
+                    scores = self._simultaneous_scores(game, valid_actions, depth)
+                    best_action = max(scores, key=scores.get)
+                else:
+                    best_action = self._search_root(game, valid_actions, depth)
+            except SearchTimeout:
+                break
+            completed_depth = depth
+            if simultaneous:
+                continue
+            # 上一层的最佳动作优先搜索
+            valid_actions.remove(best_action)
+            valid_actions.insert(0, best_action)
+        
+        move_time = time.time() - start_time
+        self.last_search = {
+            'depth': completed_depth,
+            'nodes': self._nodes,
+            'time': move_time,
+        }
+        self.total_moves += 1
+        self.total_time += move_time
+        return best_action
+
+    def _search_root(self, game, actions, depth):
+        """搜索到指定深度，返回最佳动作"""
         best_score = float('-inf')
-        best_action = valid_actions[0]
-        
-        for action in valid_actions:
-            # 克隆游戏状态
-            game_copy = env.game.clone()
-            # 执行动作
-            game_copy.step(action)
-            # 计算分数
-            score = self.minimax(game_copy, self.max_depth - 1, False)
+        best_action = actions[0]
+        for action in actions:
+            game.apply(action)
+            try:
+                score = self.minimax(game, depth - 1, False)
+            finally:
+                game.undo()
             
             if score > best_score:
                 best_score = score
@@ -29,6 +87,10 @@ class MinimaxBot(BaseAgent):
         return best_action
 
     def minimax(self, game, depth, maximizing):
+        self._nodes += 1
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchTimeout()
+        
         if depth == 0 or game.is_terminal():
             winner = game.get_winner()
             if winner == self.player_id:
@@ -38,23 +100,74 @@ class MinimaxBot(BaseAgent):
             else:
                 return 0
         
-        valid_actions = game.get_valid_actions()
+        valid_actions = self._get_search_actions(game)
         if not valid_actions:
             return 0
+        
+        if getattr(game, 'simultaneous', False):
+            return max(self._simultaneous_scores(game, valid_actions, depth).values())
             
         if maximizing:
             max_score = float('-inf')
             for action in valid_actions:
-                game_copy = game.clone()
-                game_copy.step(action)
-                score = self.minimax(game_copy, depth - 1, False)
+                game.apply(action)
+                try:
+                    score = self.minimax(game, depth - 1, False)
+                finally:
+                    game.undo()
                 max_score = max(max_score, score)
             return max_score
         else:
             min_score = float('inf')
             for action in valid_actions:
-                game_copy = game.clone()
-                game_copy.step(action)
-                score = self.minimax(game_copy, depth - 1, True)
+                game.apply(action)
+                try:
+                    score = self.minimax(game, depth - 1, True)
+                finally:
+                    game.undo()
                 min_score = min(min_score, score)
-            return min_score 
\ No newline at end of file
+            return min_score
+
+    def _simultaneous_scores(self, game, joint_actions, depth):
+        """
+        同时移动的一步：己方每个方向的得分为对方所有应对中的最小值
+
+        相当于假设对方知道己方方向后再选择，结果偏保守
+        
+        Returns:
+            {己方方向: 得分}
+        """
+        own_index = self.player_id - 1
+        scores = {}
+        for action in joint_actions:
+            game.apply(action)
+            try:
+                score = self.minimax(game, depth - 1, True)
+            finally:
+                game.undo()
+            own = action[own_index]
+            scores[own] = min(scores.get(own, score), score)
+        return scores
+
+    def _get_search_actions(self, game):
+        """获取搜索时展开的动作"""
+        if self.use_candidates:
+            return game.get_candidate_actions()
+        return game.get_valid_actions()
+
+    def reset(self):
+        """重置Minimax Bot"""
+        super().reset()
+        self.last_search = {}
+
+    def get_info(self):
+        """获取Minimax Bot信息"""
+        info = super().get_info()
+        info.update({
+            'type': 'Minimax',
+            'description': '使用迭代加深Minimax搜索的Bot',
+            'strategy': f'Iterative deepening up to depth {self.max_depth}',
+            'timeout': self.timeout,
+            'last_search': dict(self.last_search)
+        })
+        return info
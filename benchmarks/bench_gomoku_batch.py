@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+批量五子棋随机对局基准测试
+对比逐盘推进GomokuGame与BatchGomokuGame一次推进N盘的吞吐量
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from games.gomoku import GomokuGame, BatchGomokuGame
+
+
+def sequential_playouts(num_games, board_size, seed):
+    """逐盘随机对局，返回(总步数, 耗时)"""
+    rng = random.Random(seed)
+    total_steps = 0
+    start = time.perf_counter()
+    for _ in range(num_games):
+        game = GomokuGame(board_size=board_size)
+        while not game.is_terminal():
+            game.apply(rng.choice(game.get_valid_actions()))
+            total_steps += 1
+    return total_steps, time.perf_counter() - start
+
+
+def batch_playouts(num_games, board_size, seed):
+    """批量随机对局，返回(总步数, 耗时)"""
+    start = time.perf_counter()
+    batch = BatchGomokuGame(num_games, board_size, seed=seed)
+    batch.play_random()
+    return int(batch.move_count.sum()), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量五子棋随机对局基准测试')
+    parser.add_argument('--games', type=int, nargs='+', default=[100, 1000, 10000], help='对局数')
+    parser.add_argument('--board-size', type=int, default=15, help='棋盘大小')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    print(f"{'games':>7} {'impl':>10} {'steps':>9} {'playouts/s':>11} {'steps/s':>11}")
+    for num_games in args.games:
+        runs = [('batch', batch_playouts)]
+        if num_games <= 1000:
+            runs.insert(0, ('sequential', sequential_playouts))
+        for name, run in runs:
+            steps, elapsed = run(num_games, args.board_size, args.seed)
+            print(f"{num_games:>7} {name:>10} {steps:>9} {num_games / elapsed:>11.0f} {steps / elapsed:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
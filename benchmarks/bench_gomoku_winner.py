@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+五子棋胜负判定基准测试
+对比全盘扫描（旧实现）与最后一步增量判定（当前实现）的单步开销
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from games.gomoku import GomokuGame
+
+
+def full_scan_winner(game):
+    """旧版get_winner：每次扫描整个棋盘的四个方向"""
+    board = game.board
+    size = game.board_size
+    for i in range(size):
+        for j in range(size):
+            if board[i, j] == 0:
+                continue
+            player = board[i, j]
+            for dx, dy in [(1, 0), (0, 1), (1, 1), (1, -1)]:
+                count = 1
+                for k in range(1, game.win_length):
+                    x, y = i + dx * k, j + dy * k
+                    if 0 <= x < size and 0 <= y < size and board[x, y] == player:
+                        count += 1
+                    else:
+                        break
+                if count >= game.win_length:
+                    return player
+    return None
+
+
+def play_random_games(board_size, num_games, seed, legacy=False):
+    """随机对局，返回(总步数, 耗时)。legacy=True时按旧实现在每步额外调用三次全盘扫描"""
+    rng = random.Random(seed)
+    total_steps = 0
+    start = time.perf_counter()
+    for _ in range(num_games):
+        game = GomokuGame(board_size=board_size)
+        actions = game.get_valid_actions()
+        rng.shuffle(actions)
+        for action in actions:
+            game.step(action)
+            total_steps += 1
+            if legacy:
+                # 旧版step调用两次get_winner，外加一次is_terminal
+                winner = full_scan_winner(game)
+                full_scan_winner(game)
+                full_scan_winner(game)
+                if winner is not None:
+                    break
+            elif game.is_terminal():
+                break
+    return total_steps, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='五子棋胜负判定基准测试')
+    parser.add_argument('--games', type=int, default=20, help='每种棋盘的随机对局数')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[15, 19], help='棋盘大小')
+    args = parser.parse_args()
+
+    print(f"{'board':>6} {'impl':>12} {'steps':>8} {'us/step':>10}")
+    for size in args.sizes:
+        for name, legacy in (('full-scan', True), ('incremental', False)):
+            steps, elapsed = play_random_games(size, args.games, args.seed, legacy)
+            print(f"{size:>4}x{size:<2}{name:>12} {steps:>8} {elapsed / max(1, steps) * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
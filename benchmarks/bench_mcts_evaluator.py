@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+MCTS局面评估器基准测试
+对比随机模拟与批量局面评估器（不同批次大小）每秒完成的模拟次数，以及相同每步时间下的对战得分
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from games.gomoku import GomokuEnv
+from agents import MCTSBot
+
+
+def make_bot(player_id, leaf_batch, simulations, timeout):
+    """leaf_batch为0时使用随机模拟，否则使用每批leaf_batch个叶节点的局面评估器"""
+    bot = MCTSBot(player_id=player_id)
+    bot.simulation_count = simulations
+    bot.timeout = timeout
+    bot.leaf_evaluator = leaf_batch > 0
+    bot.leaf_batch = max(1, leaf_batch)
+    return bot
+
+
+def measure_speed(leaf_batch, simulations, board_size, moves):
+    """从开局连续搜索moves步，返回每秒模拟次数"""
+    env = GomokuEnv(board_size=board_size)
+    observation, _ = env.reset()
+    bots = {1: make_bot(1, leaf_batch, simulations, None), 2: make_bot(2, leaf_batch, simulations, None)}
+    total = 0
+    start = time.perf_counter()
+    for _ in range(moves):
+        if env.is_terminal():
+            break
+        bot = bots[env.game.current_player]
+        observation, *_ = env.step(bot.get_action(observation, env))
+        total += bot.last_search['iterations']
+    return total / (time.perf_counter() - start)
+
+
+def play_match(leaf_batch, move_time, board_size, games):
+    """评估器与随机模拟对战games局（轮流先手，每步限时move_time秒），返回评估器一方的得分率"""
+    score = 0.0
+    for game_index in range(games):
+        env = GomokuEnv(board_size=board_size)
+        observation, _ = env.reset()
+        evaluator_id = 1 if game_index % 2 == 0 else 2
+        bots = {evaluator_id: make_bot(evaluator_id, leaf_batch, 10 ** 9, move_time),
+                3 - evaluator_id: make_bot(3 - evaluator_id, 0, 10 ** 9, move_time)}
+        while not env.is_terminal():
+            bot = bots[env.game.current_player]
+            observation, *_ = env.step(bot.get_action(observation, env))
+        winner = env.game.get_winner()
+        if winner == evaluator_id:
+            score += 1
+        elif winner is None:
+            score += 0.5
+    return score / games
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MCTS局面评估器基准测试')
+    parser.add_argument('--batches', type=int, nargs='+', default=[0, 1, 16, 64],
+                        help='每批评估的叶节点数，0为随机模拟')
+    parser.add_argument('--simulations', type=int, default=1000, help='测速时每步的模拟次数')
+    parser.add_argument('--board-size', type=int, default=15, help='测速的棋盘边长')
+    parser.add_argument('--moves', type=int, default=10, help='测速的步数')
+    parser.add_argument('--match-board-size', type=int, default=9, help='对战的棋盘边长')
+    parser.add_argument('--move-time', type=float, default=0.3, help='对战时每步的秒数')
+    parser.add_argument('--games', type=int, default=10, help='每种批次大小的对战局数，0为不对战')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    print(f"{'batch':>6} {'sims/s':>10} {'score':>7}")
+    for leaf_batch in args.batches:
+        speed = measure_speed(leaf_batch, args.simulations, args.board_size, args.moves)
+        if args.games > 0 and leaf_batch > 0:
+            score = f"{play_match(leaf_batch, args.move_time, args.match_board_size, args.games):.2f}"
+        else:
+            score = '-'
+        print(f"{leaf_batch if leaf_batch else 'rollout':>6} {speed:>10.0f} {score:>7}")
+
+
+if __name__ == "__main__":
+    main()
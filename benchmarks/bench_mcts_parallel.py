@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+根并行MCTS基准测试
+统计不同进程数下每秒的模拟次数，以及对单进程MCTS（每进程模拟次数相同）的胜率
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from games.gomoku import GomokuEnv
+from agents import MCTSBot
+from agents.ai_bots.mcts_bot import get_worker_pool, shutdown_worker_pool
+
+
+def make_bot(player_id, num_workers, simulations):
+    """创建指定进程数和每进程模拟次数的MCTSBot"""
+    bot = MCTSBot(player_id=player_id, num_workers=num_workers)
+    bot.simulation_count = simulations
+    return bot
+
+
+def measure_speed(num_workers, simulations, board_size, moves):
+    """从开局连续搜索moves步，返回每秒模拟次数"""
+    env = GomokuEnv(board_size=board_size)
+    observation, _ = env.reset()
+    bots = {1: make_bot(1, num_workers, simulations), 2: make_bot(2, num_workers, simulations)}
+    total = 0
+    start = time.perf_counter()
+    for _ in range(moves):
+        if env.is_terminal():
+            break
+        bot = bots[env.game.current_player]
+        observation, *_ = env.step(bot.get_action(observation, env))
+        total += bot.last_search['iterations']
+    return total / (time.perf_counter() - start)
+
+
+def play_match(num_workers, simulations, board_size, games):
+    """与单进程MCTS对战games局（轮流先手），返回胜率（平局记半局）"""
+    score = 0.0
+    for game_index in range(games):
+        env = GomokuEnv(board_size=board_size)
+        observation, _ = env.reset()
+        parallel_id = 1 if game_index % 2 == 0 else 2
+        bots = {parallel_id: make_bot(parallel_id, num_workers, simulations),
+                3 - parallel_id: make_bot(3 - parallel_id, 1, simulations)}
+        while not env.is_terminal():
+            bot = bots[env.game.current_player]
+            observation, *_ = env.step(bot.get_action(observation, env))
+        winner = env.game.get_winner()
+        if winner == parallel_id:
+            score += 1
+        elif winner is None:
+            score += 0.5
+    return score / games
+
+
+def main():
+    parser = argparse.ArgumentParser(description='根并行MCTS基准测试')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16], help='进程数')
+    parser.add_argument('--simulations', type=int, default=200, help='每个进程每步的模拟次数')
+    parser.add_argument('--board-size', type=int, default=15, help='测速的棋盘边长')
+    parser.add_argument('--moves', type=int, default=10, help='测速的步数')
+    parser.add_argument('--match-board-size', type=int, default=9, help='对战的棋盘边长')
+    parser.add_argument('--games', type=int, default=10, help='每个进程数的对战局数，0为不对战')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    print(f"cpu: {os.cpu_count()}")
+    print(f"{'workers':>8} {'sims/s':>10} {'win rate':>10}")
+    for num_workers in args.workers:
+        if num_workers > 1:
+            # 进程池常驻，先创建好，不计入测速时间
+            get_worker_pool(num_workers)
+        speed = measure_speed(num_workers, args.simulations, args.board_size, args.moves)
+        if args.games > 0:
+            win_rate = f"{play_match(num_workers, args.simulations, args.match_board_size, args.games):.2f}"
+        else:
+            win_rate = '-'
+        print(f"{num_workers:>8} {speed:>10.0f} {win_rate:>10}")
+    shutdown_worker_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+MCTS模拟基准测试
+对比逐盘随机模拟与批量模拟（每个叶节点同时对弈K盘）每秒完成的模拟盘数
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from games.gomoku import GomokuGame
+from agents import MCTSBot
+
+
+def make_position(board_size, num_moves, seed):
+    """在棋盘中央附近随机落num_moves子作为模拟起点"""
+    rng = random.Random(seed)
+    game = GomokuGame(board_size=board_size)
+    center = board_size // 2
+    while game.move_count < num_moves:
+        action = (center + rng.randint(-2, 2), center + rng.randint(-2, 2))
+        if game.is_legal(action):
+            game.apply(action)
+    return game
+
+
+def run(game, batch, duration):
+    """持续duration秒从同一局面反复模拟，返回每秒模拟盘数"""
+    bot = MCTSBot(player_id=game.current_player)
+    bot.rollout_batch = batch
+    playouts = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        bot.rollout(game)
+        playouts += batch
+    return playouts / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MCTS模拟基准测试')
+    parser.add_argument('--batches', type=int, nargs='+', default=[1, 16, 64, 256], help='每个叶节点的模拟盘数')
+    parser.add_argument('--board-size', type=int, default=15, help='棋盘大小')
+    parser.add_argument('--moves', type=int, default=10, help='起始局面的棋子数')
+    parser.add_argument('--duration', type=float, default=3.0, help='每组测试的秒数')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    game = make_position(args.board_size, args.moves, args.seed)
+    baseline = None
+    print(f"{'batch':>6} {'playouts/s':>11} {'speedup':>8}")
+    for batch in args.batches:
+        speed = run(game, batch, args.duration)
+        if baseline is None:
+            baseline = speed
+        print(f"{batch:>6} {speed:>11.0f} {speed / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+MCTS渐进展开基准测试
+对比普通UCT与渐进展开在相同模拟次数下的树形（根节点展开数、最大深度）以及对战胜率
+"""
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from games.gomoku import GomokuEnv
+from agents import MCTSBot
+
+
+def make_bot(player_id, simulations, widening):
+    """创建指定模拟次数、是否渐进展开的MCTSBot"""
+    bot = MCTSBot(player_id=player_id)
+    bot.simulation_count = simulations
+    bot.timeout = None
+    bot.progressive_widening = widening
+    return bot
+
+
+def tree_shape(simulations, board_size, moves, widening):
+    """从开局连续搜索moves步，返回根节点平均展开数和平均最大深度"""
+    env = GomokuEnv(board_size=board_size)
+    observation, _ = env.reset()
+    bots = {1: make_bot(1, simulations, widening), 2: make_bot(2, simulations, widening)}
+    expanded = depth = steps = 0
+    for _ in range(moves):
+        if env.is_terminal():
+            break
+        bot = bots[env.game.current_player]
+        observation, *_ = env.step(bot.get_action(observation, env))
+        expanded += int(bot.pool.num_expanded[bot._root])
+        depth += bot.last_search['depth']
+        steps += 1
+    return expanded / steps, depth / steps
+
+
+def play_match(simulations, board_size, games):
+    """渐进展开与普通UCT对战games局（轮流先手），返回渐进展开一方的得分率（平局记半局）"""
+    score = 0.0
+    for game_index in range(games):
+        env = GomokuEnv(board_size=board_size)
+        observation, _ = env.reset()
+        widening_id = 1 if game_index % 2 == 0 else 2
+        bots = {widening_id: make_bot(widening_id, simulations, True),
+                3 - widening_id: make_bot(3 - widening_id, simulations, False)}
+        while not env.is_terminal():
+            bot = bots[env.game.current_player]
+            observation, *_ = env.step(bot.get_action(observation, env))
+        winner = env.game.get_winner()
+        if winner == widening_id:
+            score += 1
+        elif winner is None:
+            score += 0.5
+    return score / games
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MCTS渐进展开基准测试')
+    parser.add_argument('--simulations', type=int, default=300, help='每步的模拟次数')
+    parser.add_argument('--board-size', type=int, default=9, help='棋盘边长')
+    parser.add_argument('--moves', type=int, default=10, help='统计树形的步数')
+    parser.add_argument('--games', type=int, default=10, help='对战局数，0为不对战')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    print(f"{'mode':>10} {'root children':>14} {'max depth':>10}")
+    for widening in (False, True):
+        expanded, depth = tree_shape(args.simulations, args.board_size, args.moves, widening)
+        print(f"{'widening' if widening else 'uct':>10} {expanded:>14.1f} {depth:>10.1f}")
+    if args.games > 0:
+        print(f"widening score vs uct: {play_match(args.simulations, args.board_size, args.games):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+多蛇竞技场基准测试
+统计不同蛇数量和棋盘大小下每秒推进的tick数
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from games.snake import SnakeArena
+
+
+def random_actions(arena, rng, turn_prob):
+    """存活的蛇以turn_prob的概率随机转向，否则保持原方向"""
+    actions = [None] * arena.num_players
+    for i, alive in enumerate(arena.alive):
+        if alive and rng.random() < turn_prob:
+            actions[i] = rng.choice(arena.get_valid_actions(i + 1))
+    return actions
+
+
+def run(num_snakes, board_size, num_ticks, seed, turn_prob):
+    """随机推进num_ticks个tick（结束即重置），返回(每秒tick数, 每秒蛇移动数)"""
+    rng = random.Random(seed)
+    arena = SnakeArena(num_snakes, board_size, seed=seed)
+    moves = 0
+    start = time.perf_counter()
+    for _ in range(num_ticks):
+        moves += arena.alive_count
+        arena.apply(random_actions(arena, rng, turn_prob))
+        if arena.is_terminal():
+            arena.reset()
+    elapsed = time.perf_counter() - start
+    return num_ticks / elapsed, moves / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='多蛇竞技场基准测试')
+    parser.add_argument('--snakes', type=int, nargs='+', default=[2, 8, 32, 128], help='蛇的数量')
+    parser.add_argument('--board-sizes', type=int, nargs='+', default=[50, 200], help='棋盘边长')
+    parser.add_argument('--ticks', type=int, default=2000, help='推进的tick数')
+    parser.add_argument('--turn-prob', type=float, default=0.2, help='每个tick随机转向的概率')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    print(f"{'board':>7} {'snakes':>7} {'ticks/s':>10} {'moves/s':>10}")
+    for board_size in args.board_sizes:
+        for num_snakes in args.snakes:
+            ticks_per_sec, moves_per_sec = run(num_snakes, board_size, args.ticks, args.seed, args.turn_prob)
+            print(f"{board_size:>7} {num_snakes:>7} {ticks_per_sec:>10.0f} {moves_per_sec:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+批量贪吃蛇随机对局基准测试
+对比逐局推进SnakeGame（同时移动模式）与BatchSnakeGame一次推进N局的吞吐量
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from games.snake import SnakeGame, BatchSnakeGame
+
+
+def sequential_ticks(num_games, board_size, num_ticks, seed):
+    """逐局随机推进，结束即重置，返回耗时"""
+    rng = random.Random(seed)
+    games = [SnakeGame(board_size, simultaneous=True) for _ in range(num_games)]
+    start = time.perf_counter()
+    for _ in range(num_ticks):
+        for game in games:
+            game.step((rng.choice(game.get_valid_actions(1)), rng.choice(game.get_valid_actions(2))))
+            if game.is_terminal():
+                game.reset()
+    return time.perf_counter() - start
+
+
+def batch_ticks(num_games, board_size, num_ticks, seed):
+    """批量随机推进（自动重置），返回耗时"""
+    batch = BatchSnakeGame(num_games, board_size, seed=seed)
+    start = time.perf_counter()
+    batch.play_random(num_ticks)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量贪吃蛇随机对局基准测试')
+    parser.add_argument('--games', type=int, nargs='+', default=[100, 1000, 10000], help='对局数')
+    parser.add_argument('--board-size', type=int, default=20, help='棋盘大小')
+    parser.add_argument('--ticks', type=int, default=200, help='每局推进的tick数')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    print(f"{'games':>7} {'impl':>10} {'ticks/s':>11}")
+    for num_games in args.games:
+        runs = [('batch', batch_ticks)]
+        if num_games <= 1000:
+            runs.insert(0, ('sequential', sequential_ticks))
+        for name, run in runs:
+            elapsed = run(num_games, args.board_size, args.ticks, args.seed)
+            print(f"{num_games:>7} {name:>10} {num_games * args.ticks / elapsed:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
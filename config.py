@@ -46,6 +46,22 @@ AI_CONFIGS = {
         'simulation_count': 1000,
         'exploration_constant': 1.414,
         'timeout': 10,
+        'use_candidates': True,  # 只展开棋子附近的候选点
+        'num_workers': 1,  # 根并行的进程数，1为单进程搜索
+        'rollout_batch': 1,  # 每个叶节点同时随机对弈的盘数，大于1时使用批量模拟器
+        'max_rollout_depth': 500,  # 每盘模拟最多走的步数，走满时按平局计
+        'rave': False,  # 是否使用RAVE（AMAF）统计选择子节点
+        'rave_schedule': 'equivalence',  # RAVE权重：'equivalence'为sqrt(k/(3n+k))，'mse'为ñ/(n+ñ+4b²nñ)
+        'rave_equivalence': 1000,  # equivalence方案的k，约为RAVE与UCT权重相等时的访问次数
+        'rave_bias': 0.1,  # mse方案的b
+        'progressive_widening': False,  # 渐进展开：子边按游戏给出的先验排序，只考虑前ceil(C·N^α)条
+        'widening_constant': 2.0,  # 渐进展开的C
+        'widening_exponent': 0.5,  # 渐进展开的α，N为节点访问次数
+        'leaf_evaluator': False,  # 用游戏的批量局面评估器代替随机模拟
+        'leaf_batch': 16,  # 每次调用评估器评估的叶节点数
+        'virtual_loss': 1,  # 叶节点等待评估时路径上每个节点暂记的失败次数
+        'max_tree_bytes': 256 * 1024 * 1024,  # 节点池内存上限（每个搜索进程一份，预分配），用满时淘汰访问次数最少的节点
+        'edges_per_node': 8,  # 内存按每节点最多53字节、每条边20字节划分，默认约120万个节点、960万条边
     },
     'rl': {
         'learning_rate': 0.1,
@@ -44,8 +44,7 @@ class BaseEnv(ABC):
     def step(self, action: Any) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
         """执行动作"""
         # 检查动作是否有效
-        valid_actions = self.game.get_valid_actions(self.game.current_player)
-        if action not in valid_actions:
+        if not self.game.is_legal(action):
             return self._get_observation(), -1000, True, False, {'error': 'Invalid action'}
         
         # 执行动作
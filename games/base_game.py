@@ -4,6 +4,8 @@
 """
 
 import time
+import random
+import numpy as np
 from abc import ABC, abstractmethod
 from typing import Dict, List, Tuple, Any, Optional
 import config
@@ -12,6 +14,9 @@ import config
 class BaseGame(ABC):
     """游戏基类"""
     
+    # 玩家数量，玩家编号为 1..num_players
+    num_players = 2
+    
     def __init__(self, game_config: Dict[str, Any] = None):
         self.game_config = game_config or {}
         self.current_player = 1  # 1 或 2
@@ -20,6 +25,7 @@ class BaseGame(ABC):
         self.start_time = time.time()
         self.last_move_time = time.time()
         self.history = []  # 游戏历史记录
+        self._undo_stack = []  # apply/undo 的撤销记录
         
         self.reset()
     
@@ -70,8 +76,8 @@ class BaseGame(ABC):
         pass
     
     def switch_player(self):
-        """切换玩家"""
-        self.current_player = 3 - self.current_player  # 1 -> 2, 2 -> 1
+        """切换到下一名玩家，按 1 -> 2 -> ... -> num_players -> 1 轮转"""
+        self.current_player = self.current_player % self.num_players + 1
     
     def is_timeout(self) -> bool:
         """检查是否超时"""
@@ -123,15 +129,113 @@ class BaseGame(ABC):
         self.move_count += 1
         self.last_move_time = time.time()
     
+    def get_candidate_actions(self) -> List[Any]:
+        """获取供搜索使用的候选动作，默认为全部有效动作（同时移动的游戏为联合动作），子类可做剪枝"""
+        return self.get_valid_actions()
+    
+    def get_action_priors(self, actions: List[Any]) -> np.ndarray:
+        """
+        当前玩家各动作的先验分数（越大越值得先搜索），供渐进展开排序子节点
+
+        默认各动作相同，子类可按游戏知识覆盖；只需保证相对大小有意义
+
+        Returns:
+            (len(actions),) 非负分数
+        """
+        return np.ones(len(actions))
+    
+    def get_leaf_state(self) -> Any:
+        """
+        当前局面供evaluate_leaf_states使用的快照，之后局面再变化也不影响快照
+
+        支持局面评估器的子类需要同时实现本方法和evaluate_leaf_states
+        """
+        raise NotImplementedError(f"{self.__class__.__name__}不支持局面评估器")
+    
+    def evaluate_leaf_states(self, states: List[Any]) -> np.ndarray:
+        """
+        一次调用批量评估get_leaf_state得到的多个非终局局面，代替随机模拟
+
+        Returns:
+            (len(states), num_players + 1) 各局面按玩家编号索引的预期得分（胜1、平0.5、负0），第0列不使用
+        """
+        raise NotImplementedError(f"{self.__class__.__name__}不支持局面评估器")
+    
+    def is_legal(self, action: Any) -> bool:
+        """检查当前玩家的动作是否合法，子类可覆盖为O(1)实现"""
+        return action in self.get_valid_actions(self.current_player)
+    
     def get_legal_actions(self, player: int = None) -> List[Any]:
         """获取合法动作（别名）"""
         return self.get_valid_actions(player)
     
+    def apply(self, action: Any) -> None:
+        """
+        执行动作并压入撤销记录，供树搜索原地使用
+        
+        与step不同，apply不做合法性检查，也不构造观察和奖励
+        """
+        raise NotImplementedError("子类必须实现apply方法")
+    
+    def undo(self) -> None:
+        """撤销最近一次apply（或step）执行的动作"""
+        raise NotImplementedError("子类必须实现undo方法")
+    
+    def random_playouts(self, num_playouts: int, seed: Optional[int] = None,
+                        max_depth: Optional[int] = None, deadline: Optional[float] = None) -> np.ndarray:
+        """
+        从当前局面均匀随机对弈num_playouts盘到结束，局面保持不变
+
+        默认逐盘apply/undo，子类可用批量模拟器覆盖
+
+        Args:
+            max_depth: 每盘最多走的步数，走满时按平局计，None表示不限
+            deadline: 截止时刻（time.perf_counter），到达后尚未结束的各盘按平局计
+
+        Returns:
+            (num_playouts,) 各盘获胜者，0表示平局
+        """
+        rng = random.Random(seed)
+        winners = np.zeros(num_playouts, dtype=np.int8)
+        for i in range(num_playouts):
+            depth = 0
+            while not self.is_terminal():
+                if max_depth is not None and depth >= max_depth:
+                    break
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                valid_actions = self.get_valid_actions()
+                if not valid_actions:
+                    break
+                self.apply(rng.choice(valid_actions))
+                depth += 1
+            winners[i] = self.get_winner() or 0
+            for _ in range(depth):
+                self.undo()
+        return winners
+    
+    @property
+    def hash(self) -> int:
+        """局面的64位Zobrist哈希，由子类在走子和撤销时增量维护"""
+        raise NotImplementedError("子类必须实现hash属性")
+    
     def clone(self) -> 'BaseGame':
         """克隆游戏状态"""
         # 子类需要实现具体的克隆逻辑
         raise NotImplementedError("子类必须实现clone方法")
     
+    def _shallow_clone(self) -> 'BaseGame':
+        """
+        不经过__init__/reset创建同类对象，供子类实现clone
+        
+        新对象先与原对象共享全部属性（配置、哈希键表等不可变数据无需复制），
+        子类再替换其中的可变状态；撤销记录从空开始
+        """
+        new_game = object.__new__(self.__class__)
+        new_game.__dict__.update(self.__dict__)
+        new_game._undo_stack = []
+        return new_game
+    
     def get_action_space(self) -> Any:
         """获取动作空间"""
         # 子类需要实现具体的动作空间定义
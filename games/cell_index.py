@@ -0,0 +1,60 @@
+"""
+格子集合索引
+用下标数组+位置表实现O(1)的增删、成员判断和均匀随机抽取
+"""
+
+import random
+from typing import Any, Hashable, Iterable, Iterator, List
+
+
+class CellIndex:
+    """格子集合，删除时把末尾元素换到被删位置（swap-remove）"""
+
+    __slots__ = ('_items', '_positions')
+
+    def __init__(self, items: Iterable[Hashable] = ()):
+        self._items = list(items)
+        self._positions = {item: i for i, item in enumerate(self._items)}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._positions
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._items)
+
+    def add(self, item: Hashable):
+        """加入格子（已存在时忽略）"""
+        if item not in self._positions:
+            self._positions[item] = len(self._items)
+            self._items.append(item)
+
+    def remove(self, item: Hashable):
+        """移除格子，不存在时抛出KeyError"""
+        index = self._positions.pop(item)
+        last = self._items.pop()
+        if index < len(self._items):
+            self._items[index] = last
+            self._positions[last] = index
+
+    def discard(self, item: Hashable):
+        """移除格子（不存在时忽略）"""
+        if item in self._positions:
+            self.remove(item)
+
+    def items(self) -> List[Hashable]:
+        """以列表形式返回全部格子（顺序随增删变化）"""
+        return self._items.copy()
+
+    def sample(self, rng: Any = random) -> Hashable:
+        """均匀随机取一个格子，集合为空时抛出IndexError"""
+        return rng.choice(self._items)
+
+    def copy(self) -> 'CellIndex':
+        """浅拷贝"""
+        new_index = CellIndex.__new__(CellIndex)
+        new_index._items = self._items.copy()
+        new_index._positions = self._positions.copy()
+        return new_index
@@ -3,6 +3,8 @@
 """
 
 from .gomoku_game import GomokuGame
+from .bitboard_game import BitboardGomokuGame
+from .batch_gomoku import BatchGomokuGame
 from .gomoku_env import GomokuEnv
 
-__all__ = ['GomokuGame', 'GomokuEnv'] 
\ No newline at end of file
+__all__ = ['GomokuGame', 'BitboardGomokuGame', 'BatchGomokuGame', 'GomokuEnv'] 
\ No newline at end of file
@@ -0,0 +1,204 @@
+"""
+批量五子棋模拟器
+把N盘棋存放在一个 (N, S, S) 的int8数组中，一次调用同时推进所有棋盘
+"""
+
+import numpy as np
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from games.gomoku.gomoku_game import GomokuGame
+
+
+@lru_cache(maxsize=None)
+def _window_indices(board_size: int, win_length: int) -> np.ndarray:
+    """棋盘上所有长度为win_length的连线窗口 (W, win_length)，元素为展平的格子下标"""
+    windows = []
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for row in range(board_size):
+            for col in range(board_size):
+                end_row = row + dr * (win_length - 1)
+                end_col = col + dc * (win_length - 1)
+                if 0 <= end_row < board_size and 0 <= end_col < board_size:
+                    windows.append([(row + dr * k) * board_size + col + dc * k for k in range(win_length)])
+    return np.array(windows, dtype=np.int64).reshape(-1, win_length)
+
+
+class BatchGomokuGame:
+    """N盘五子棋的向量化模拟器，用于大量随机对局和MCTS模拟"""
+
+    def __init__(self, num_games: int, board_size: int = 15, win_length: int = 5,
+                 seed: Optional[int] = None):
+        self.num_games = num_games
+        self.board_size = board_size
+        self.win_length = win_length
+        self.rng = np.random.default_rng(seed)
+
+        # 四周各留win_length-1格空白，检查连子时无需判断边界
+        pad = win_length - 1
+        self._pad = pad
+        self._padded = np.zeros((num_games, board_size + 2 * pad, board_size + 2 * pad), dtype=np.int8)
+        self.boards = self._padded[:, pad:pad + board_size, pad:pad + board_size]
+
+        # 以落子点为中心，四个方向各2*pad+1个格子的偏移
+        steps = np.arange(-pad, pad + 1)
+        directions = np.array([(0, 1), (1, 0), (1, 1), (1, -1)])
+        self._line_rows = directions[:, 0:1] * steps  # (4, 2*pad+1)
+        self._line_cols = directions[:, 1:2] * steps
+
+        self.current_player = np.ones(num_games, dtype=np.int8)
+        self.move_count = np.zeros(num_games, dtype=np.int32)
+        self.done = np.zeros(num_games, dtype=bool)
+        self.winner = np.zeros(num_games, dtype=np.int8)  # 0表示无人获胜
+
+    @classmethod
+    def from_game(cls, game: GomokuGame, num_games: int, seed: Optional[int] = None) -> 'BatchGomokuGame':
+        """把一个GomokuGame局面复制为num_games盘"""
+        batch = cls(num_games, game.board_size, game.win_length, seed)
+        batch.boards[:] = game.board
+        batch.current_player[:] = game.current_player
+        batch.move_count[:] = game.move_count
+        batch.done[:] = game.is_terminal()
+        batch.winner[:] = game.get_winner() or 0
+        return batch
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """重置全部棋盘，或只重置mask为True的棋盘"""
+        if mask is None:
+            mask = np.ones(self.num_games, dtype=bool)
+        self._padded[mask] = 0
+        self.current_player[mask] = 1
+        self.move_count[mask] = 0
+        self.done[mask] = False
+        self.winner[mask] = 0
+        return self.boards
+
+    def get_legal_mask(self) -> np.ndarray:
+        """合法动作掩码 (N, S, S)，已结束的棋盘全为False"""
+        return (self.boards == 0) & ~self.done[:, None, None]
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """
+        每盘各走一步，已结束的棋盘忽略对应动作
+
+        Args:
+            actions: (N,) 展平的格子下标，或 (N, 2) 的(row, col)
+
+        Returns:
+            observation: 所有棋盘 (N, S, S)
+            reward: 落子方的奖励，获胜1、平局0.5、非法落子-1，其余0
+            done: 每盘是否结束
+            info: 'legal_mask' 合法动作掩码，'winner' 获胜者（0为无）
+        """
+        actions = np.asarray(actions)
+        if actions.ndim == 1:
+            rows, cols = np.divmod(actions, self.board_size)
+        else:
+            rows, cols = actions[:, 0], actions[:, 1]
+
+        active = np.flatnonzero(~self.done)
+        rows, cols = rows[active], cols[active]
+        players = self.current_player[active]
+        reward = np.zeros(self.num_games, dtype=np.float32)
+
+        # 非法落子：与GomokuGame一致，奖励-1并结束
+        illegal = self.boards[active, rows, cols] != 0
+        reward[active[illegal]] = -1
+        self.done[active[illegal]] = True
+
+        legal = ~illegal
+        active, rows, cols, players = active[legal], rows[legal], cols[legal], players[legal]
+        self.boards[active, rows, cols] = players
+        self.move_count[active] += 1
+
+        won = self._check_last_move(active, rows, cols, players)
+        self.winner[active[won]] = players[won]
+        reward[active[won]] = 1
+        full = ~won & (self.move_count[active] >= self.board_size * self.board_size)
+        reward[active[full]] = 0.5
+        self.done[active[won | full]] = True
+        self.current_player[active] = 3 - players
+
+        info = {'legal_mask': self.get_legal_mask(), 'winner': self.winner.copy()}
+        return self.boards, reward, self.done.copy(), info
+
+    def _check_last_move(self, games: np.ndarray, rows: np.ndarray, cols: np.ndarray,
+                         players: np.ndarray) -> np.ndarray:
+        """只检查最后落子周围的四条线，返回每盘是否形成win_length连"""
+        if len(games) == 0:
+            return np.zeros(0, dtype=bool)
+        pad = self._pad
+        # (n, 4, 2*pad+1) 的线段
+        line_rows = rows[:, None, None] + pad + self._line_rows
+        line_cols = cols[:, None, None] + pad + self._line_cols
+        lines = self._padded[games[:, None, None], line_rows, line_cols] == players[:, None, None]
+        # 前缀和求每个长度为win_length的窗口内同色棋子数
+        counts = np.cumsum(lines, axis=2, dtype=np.int16)
+        counts = np.concatenate([np.zeros(counts.shape[:2] + (1,), dtype=np.int16), counts], axis=2)
+        windows = counts[:, :, self.win_length:] - counts[:, :, :-self.win_length]
+        return (windows >= self.win_length).any(axis=(1, 2))
+
+    def random_actions(self, max_rejections: int = 8) -> np.ndarray:
+        """
+        为每盘均匀随机选一个合法动作（展平下标），已结束的棋盘返回0
+
+        先整体随机抽格子，只对抽到已占格子的棋盘重抽；重抽max_rejections轮后
+        仍未成功的棋盘（几乎下满）改用合法掩码抽样
+        """
+        size = self.board_size
+        actions = np.zeros(self.num_games, dtype=np.int64)
+        pending = np.flatnonzero(~self.done)
+        for _ in range(max_rejections):
+            actions[pending] = self.rng.integers(0, size * size, len(pending))
+            rows, cols = np.divmod(actions[pending], size)
+            pending = pending[self.boards[pending, rows, cols] != 0]
+            if len(pending) == 0:
+                return actions
+
+        legal = (self.boards[pending] == 0).reshape(len(pending), -1)
+        scores = np.where(legal, self.rng.random(legal.shape), -1.0)
+        actions[pending] = scores.argmax(axis=1)
+        return actions
+
+    def random_outcomes(self) -> np.ndarray:
+        """
+        不逐步推进，直接求出每盘从当前局面均匀随机对弈到结束的获胜者（0为平局），棋盘不变
+
+        均匀随机对弈等价于把空格随机排列后依次落子：按随机顺序填满棋盘并记下每格的落子序号，
+        同色连线窗口的形成时刻为窗口内最大的序号，最早形成的窗口决定胜负。
+        已结束的棋盘返回其获胜者
+        """
+        winners = self.winner.copy()
+        active = np.flatnonzero(~self.done)
+        windows = _window_indices(self.board_size, self.win_length)
+        if len(active) == 0 or len(windows) == 0:
+            return winners
+
+        cells = self.board_size * self.board_size
+        boards = self.boards[active].reshape(len(active), cells)
+        empty = boards == 0
+        # 空格按随机键排序得到落子顺序，已有棋子排在最后
+        keys = np.where(empty, self.rng.random(boards.shape), 2.0)
+        order = np.argsort(keys, axis=1)
+        times = np.empty_like(order)
+        np.put_along_axis(times, order, np.arange(cells), axis=1)
+        times[~empty] = -1
+        movers = self.current_player[active, None]
+        colors = np.where(empty, np.where(times % 2 == 0, movers, 3 - movers), boards)
+
+        line_colors = colors[:, windows]  # (n, W, win_length)
+        complete = (line_colors == line_colors[:, :, :1]).all(axis=2) & (line_colors[:, :, 0] != 0)
+        finish = np.where(complete, times[:, windows].max(axis=2), cells)
+        first = finish.argmin(axis=1)
+        rows = np.arange(len(active))
+        winners[active] = np.where(finish[rows, first] < cells, line_colors[rows, first, 0], 0)
+        return winners
+
+    def play_random(self, max_steps: Optional[int] = None) -> np.ndarray:
+        """所有棋盘随机对弈到结束，返回获胜者数组（0为平局）"""
+        if max_steps is None:
+            max_steps = self.board_size * self.board_size
+        for _ in range(max_steps):
+            if self.done.all():
+                break
+            self.step(self.random_actions())
+        return self.winner.copy()
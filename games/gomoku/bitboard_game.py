@@ -0,0 +1,91 @@
+"""
+五子棋位棋盘（bitboard）后端
+每个玩家用一个Python大整数表示棋子分布，行尾补一列空位防止移位越行
+"""
+
+import numpy as np
+from games.gomoku.gomoku_game import GomokuGame
+
+
+class BitboardGomokuGame(GomokuGame):
+    """使用位棋盘实现的五子棋，接口与GomokuGame一致"""
+
+    def __init__(self, board_size: int = 15, win_length: int = 5, **kwargs):
+        # 每行占 board_size + 1 位，最后一位恒为0作为边界
+        self.stride = board_size + 1
+        # 四个方向对应的位移：水平、垂直、主对角线、副对角线
+        self.shifts = (1, self.stride, self.stride + 1, self.stride - 1)
+        self.bitboards = [0, 0, 0]  # 下标为玩家编号，0号位不用
+        self._board_cache = None
+        super().__init__(board_size, win_length, **kwargs)
+
+    @property
+    def board(self) -> np.ndarray:
+        """按需从位棋盘生成只读numpy棋盘，落子前一直复用缓存"""
+        if self._board_cache is None:
+            board = np.zeros((self.board_size, self.board_size), dtype=int)
+            for player in (1, 2):
+                board[self._unpack(self.bitboards[player])] = player
+            board.flags.writeable = False
+            self._board_cache = board
+        return self._board_cache
+
+    @board.setter
+    def board(self, value: np.ndarray):
+        """加载局面，与GomokuGame共用_load_board"""
+        self._load_board(value)
+
+    def _store_stones(self, board: np.ndarray):
+        """把numpy棋盘打包为位棋盘"""
+        value = np.asarray(board)
+        self.bitboards = [0, 0, 0]
+        for player in (1, 2):
+            bits = 0
+            for row, col in zip(*np.nonzero(value == player)):
+                bits |= 1 << self._bit(int(row), int(col))
+            self.bitboards[player] = bits
+        self._board_cache = None
+
+    def _unpack(self, bits: int) -> np.ndarray:
+        """把位棋盘展开为 (board_size, board_size) 的布尔数组"""
+        num_bits = self.board_size * self.stride
+        raw = np.frombuffer(bits.to_bytes((num_bits + 7) // 8, 'little'), dtype=np.uint8)
+        flat = np.unpackbits(raw, bitorder='little')[:num_bits]
+        return flat.reshape(self.board_size, self.stride)[:, :self.board_size].astype(bool)
+
+    def _bit(self, row: int, col: int) -> int:
+        """坐标对应的位序号"""
+        return row * self.stride + col
+
+    def _place_stone(self, row: int, col: int, player: int):
+        """落子：一次按位或"""
+        self.bitboards[player] |= 1 << self._bit(row, col)
+        self._board_cache = None
+
+    def _remove_stone(self, row: int, col: int):
+        """提子：对所在玩家的位棋盘做一次异或"""
+        bit = 1 << self._bit(row, col)
+        player = 1 if self.bitboards[1] & bit else 2
+        self.bitboards[player] ^= bit
+        self._board_cache = None
+
+    def _check_win(self, row: int, col: int, player: int) -> bool:
+        """用移位与运算检查玩家是否已有连续win_length子"""
+        bits = self.bitboards[player]
+        for shift in self.shifts:
+            run = bits
+            length = 1
+            # 倍增：run的第i位为1表示从i出发沿该方向连续length子
+            while length * 2 <= self.win_length:
+                run &= run >> (shift * length)
+                length *= 2
+            if length < self.win_length:
+                run &= run >> (shift * (self.win_length - length))
+            if run:
+                return True
+        return False
+
+    def _clone_stones(self, new_game: 'BitboardGomokuGame'):
+        """复制位棋盘，克隆对象的棋盘缓存在首次访问时重建"""
+        new_game.bitboards = self.bitboards.copy()
+        new_game._board_cache = None
@@ -7,15 +7,28 @@ import numpy as np
 from typing import Dict, List, Tuple, Any, Optional
 from games.base_env import BaseEnv
 from games.gomoku.gomoku_game import GomokuGame
+from games.gomoku.bitboard_game import BitboardGomokuGame
+
+
+# 可选的五子棋引擎后端
+GAME_BACKENDS = {
+    'numpy': GomokuGame,
+    'bitboard': BitboardGomokuGame,
+}
 
 
 class GomokuEnv(BaseEnv):
     """五子棋环境"""
     
-    def __init__(self, board_size: int = 15, win_length: int = 5):
+    def __init__(self, board_size: int = 15, win_length: int = 5, backend: str = 'numpy',
+                 candidate_distance: int = 2):
+        if backend not in GAME_BACKENDS:
+            raise ValueError(f"不支持的五子棋后端: {backend}")
         self.board_size = board_size
         self.win_length = win_length
-        game = GomokuGame(board_size, win_length)
+        self.backend = backend
+        self.candidate_distance = candidate_distance
+        game = GAME_BACKENDS[backend](board_size, win_length, candidate_distance=candidate_distance)
         super().__init__(game)
     
     def _setup_spaces(self):
@@ -84,7 +97,8 @@ class GomokuEnv(BaseEnv):
     
     def clone(self) -> 'GomokuEnv':
         """克隆环境"""
-        cloned_game = self.game.clone()
-        cloned_env = GomokuEnv(self.board_size, self.win_length)
-        cloned_env.game = cloned_game
+        # 不重新构造游戏，只克隆游戏状态，其余属性与原环境共享
+        cloned_env = object.__new__(self.__class__)
+        cloned_env.__dict__.update(self.__dict__)
+        cloned_env.game = self.game.clone()
         return cloned_env 
\ No newline at end of file
@@ -3,27 +3,59 @@
 """
 
 import numpy as np
+from functools import lru_cache
 from typing import Dict, List, Tuple, Any, Optional
 from games.base_game import BaseGame
+from games.cell_index import CellIndex
+from games.zobrist import zobrist_keys, DEFAULT_SEED
 import config
 
 
+@lru_cache(maxsize=None)
+def _neighborhoods(board_size: int, distance: int) -> Tuple[Tuple[Tuple[Tuple[int, int], int], ...], ...]:
+    """每个格子切比雪夫距离distance以内的格子，元素为((row, col), 展平下标)"""
+    neighborhoods = []
+    for row in range(board_size):
+        for col in range(board_size):
+            neighborhoods.append(tuple(
+                ((r, c), r * board_size + c)
+                for r in range(max(0, row - distance), min(board_size, row + distance + 1))
+                for c in range(max(0, col - distance), min(board_size, col + distance + 1))
+            ))
+    return tuple(neighborhoods)
+
+
 class GomokuGame(BaseGame):
     """五子棋游戏"""
     
-    def __init__(self, board_size: int = 15, win_length: int = 5, **kwargs):
+    def __init__(self, board_size: int = 15, win_length: int = 5,
+                 zobrist_seed: int = DEFAULT_SEED, candidate_distance: int = 2, **kwargs):
         self.board_size = board_size
         self.win_length = win_length
-        self.board = np.zeros((self.board_size, self.board_size), dtype=int)
+        self.candidate_distance = candidate_distance
+        self._neighborhoods = _neighborhoods(board_size, candidate_distance)
+        self.zobrist_seed = zobrist_seed
+        # Zobrist键：前半为玩家1各格子，后半为玩家2各格子，最后一个表示轮到玩家2
+        keys = zobrist_keys(2 * board_size * board_size + 1, zobrist_seed)
+        self._stone_keys = keys[:-1]
+        self._side_key = keys[-1]
         super().__init__({'board_size': board_size, 'win_length': win_length})
     
     def reset(self) -> Dict[str, Any]:
         """重置游戏状态"""
-        self.board = np.zeros((self.board_size, self.board_size), dtype=int)
+        self._store_stones(np.zeros((self.board_size, self.board_size), dtype=int))
+        self.winner = None  # 由最后一步增量判定并缓存
+        self._hash = 0
+        # 空格索引，落子/撤销时O(1)维护
+        self._empty = CellIndex((i, j) for i in range(self.board_size) for j in range(self.board_size))
+        # 候选点：距任一棋子candidate_distance以内的空格；_near_count记录每格附近的棋子数
+        self._candidates = CellIndex()
+        self._near_count = [0] * (self.board_size * self.board_size)
         self.current_player = 1
         self.game_state = config.GameState.ONGOING
         self.move_count = 0
         self.history = []
+        self._undo_stack = []
         
         return self.get_state()
     
@@ -42,47 +74,95 @@ class GomokuGame(BaseGame):
         """
         row, col = action
         
-        if self.board[row, col] != 0:
+        if not self._is_empty(row, col):
             return self.get_state(), -1, True, {'error': 'Invalid move'}
         
-        self.board[row, col] = self.current_player
-        self.history.append((self.current_player, (row, col)))
-        self.move_count += 1
+        player = self.current_player
+        self.apply((row, col))
         done = self.is_terminal()
-        reward = 1 if self.get_winner() == self.current_player else 0
+        reward = 1 if self.winner == player else 0
         info = {}
-        if done and self.get_winner() is None:
+        if done and self.winner is None:
             reward = 0.5
-        self.switch_player()
         
         return self.get_state(), reward, done, info
     
+    def apply(self, action: Tuple[int, int]) -> None:
+        """落子并切换玩家，不做合法性检查，可用undo撤销"""
+        row, col = action
+        player = self.current_player
+        self._undo_stack.append((row, col, player, self.winner))
+        self._place_stone(row, col, player)
+        self._empty.remove((row, col))
+        self._add_neighborhood(row, col)
+        self._hash ^= self._stone_key(row, col, player)
+        self.history.append((player, (row, col)))
+        self.move_count += 1
+        # 只有刚落下的棋子可能形成新的五连
+        if self.winner is None and self._check_win(row, col, player):
+            self.winner = player
+        self.switch_player()
+    
+    def undo(self) -> None:
+        """撤销最近一步落子"""
+        row, col, player, winner = self._undo_stack.pop()
+        self._remove_stone(row, col)
+        self._empty.add((row, col))
+        self._remove_neighborhood(row, col)
+        self._hash ^= self._stone_key(row, col, player)
+        self.history.pop()
+        self.move_count -= 1
+        self.winner = winner
+        self.current_player = player
+    
+    @property
+    def board(self) -> np.ndarray:
+        """棋盘 (board_size, board_size)，0为空、1/2为玩家；只读视图，加载局面请整体赋值"""
+        view = self._board.view()
+        view.flags.writeable = False
+        return view
+    
+    @board.setter
+    def board(self, value: np.ndarray):
+        """加载局面，见_load_board"""
+        self._load_board(value)
+    
+    @property
+    def hash(self) -> int:
+        """局面的64位Zobrist哈希（含轮到哪方走）"""
+        return self._hash ^ self._side_key if self.current_player == 2 else self._hash
+    
     def get_valid_actions(self, player: int = None) -> List[Tuple[int, int]]:
-        """获取有效动作列表"""
-        return [(i, j) for i in range(self.board_size) for j in range(self.board_size) if self.board[i, j] == 0]
+        """获取有效动作列表（由空格索引直接拷贝，撤销后顺序可能变化）"""
+        return self._empty.items()
+    
+    def get_candidate_actions(self) -> List[Tuple[int, int]]:
+        """
+        获取候选动作：距已有棋子candidate_distance以内的空格
+        
+        空棋盘时只返回天元；附近没有空格时退回全部有效动作
+        """
+        if len(self._empty) == self.board_size * self.board_size:
+            center = self.board_size // 2
+            return [(center, center)]
+        if len(self._candidates) == 0:
+            return self.get_valid_actions()
+        return self._candidates.items()
+    
+    def is_legal(self, action: Tuple[int, int]) -> bool:
+        """O(1)检查动作是否合法"""
+        try:
+            return tuple(action) in self._empty
+        except TypeError:
+            return False
     
     def is_terminal(self) -> bool:
         """检查游戏是否结束"""
-        return self.get_winner() is not None or self.move_count >= self.board_size * self.board_size
+        return self.winner is not None or self.move_count >= self.board_size * self.board_size
     
     def get_winner(self) -> Optional[int]:
-        """获取获胜者"""
-        for i in range(self.board_size):
-            for j in range(self.board_size):
-                if self.board[i, j] == 0:
-                    continue
-                player = self.board[i, j]
-                for dx, dy in [(1,0),(0,1),(1,1),(1,-1)]:
-                    count = 1
-                    for k in range(1, self.win_length):
-                        x, y = i+dx*k, j+dy*k
-                        if 0<=x<self.board_size and 0<=y<self.board_size and self.board[x, y]==player:
-                            count += 1
-                        else:
-                            break
-                    if count >= self.win_length:
-                        return player
-        return None
+        """获取获胜者（在step中根据最后一步增量更新）"""
+        return self.winner
     
     def get_state(self) -> Dict[str, Any]:
         """获取当前游戏状态"""
@@ -98,16 +178,76 @@ class GomokuGame(BaseGame):
         return self.board.copy()
     
     def clone(self) -> 'GomokuGame':
-        """克隆游戏状态"""
-        import copy
-        new_game = GomokuGame(self.board_size, self.win_length)
-        new_game.board = self.board.copy()
-        new_game.current_player = self.current_player
-        new_game.game_state = self.game_state
-        new_game.move_count = self.move_count
-        new_game.history = copy.deepcopy(self.history)
+        """克隆游戏状态：只复制可变状态，配置、邻域表和键表与原对象共享"""
+        new_game = self._shallow_clone()
+        self._clone_stones(new_game)
+        new_game._empty = self._empty.copy()
+        new_game._candidates = self._candidates.copy()
+        new_game._near_count = self._near_count.copy()
+        # 历史记录的条目是不可变元组，浅拷贝即可共享
+        new_game.history = self.history.copy()
         return new_game
     
+    def random_playouts(self, num_playouts: int, seed: Optional[int] = None,
+                        max_depth: Optional[int] = None, deadline: Optional[float] = None) -> np.ndarray:
+        """
+        用批量模拟器一次求出num_playouts盘随机对弈的结果，返回各盘获胜者（0为平局）
+
+        棋盘下满即结束，模拟步数本身有上限，不使用max_depth和deadline
+        """
+        from games.gomoku.batch_gomoku import BatchGomokuGame
+        return BatchGomokuGame.from_game(self, num_playouts, seed).random_outcomes()
+    
+    def get_leaf_state(self) -> Tuple[np.ndarray, int]:
+        """局面快照：(棋盘副本, 轮到走的玩家)"""
+        return self.board.copy(), self.current_player
+    
+    def evaluate_leaf_states(self, states: List[Tuple[np.ndarray, int]]) -> np.ndarray:
+        """用棋型评估一次求出整批局面双方的预期得分"""
+        from games.gomoku.pattern_eval import evaluate_boards
+        boards = np.stack([board for board, _ in states])
+        players = np.array([player for _, player in states])
+        value = evaluate_boards(boards, players, self.win_length)
+        return np.stack([np.zeros_like(value), value, 1 - value], axis=1)
+    
+    def get_action_priors(self, actions: List[Tuple[int, int]]) -> np.ndarray:
+        """
+        候选点的先验分数：在该点落子后己方能连成的最长线、对方在该点能连成的最长线（即需要堵的），
+        再加上周围8格的棋子数
+
+        成五 > 堵五 > 活四级别的连子 > ... > 单纯靠近棋子；所有候选点一次向量化求出
+        """
+        size = self.board_size
+        reach = self.win_length - 1
+        padded = np.zeros((size + 2 * reach, size + 2 * reach), dtype=self.board.dtype)
+        padded[reach:reach + size, reach:reach + size] = self.board
+        rows = np.fromiter((action[0] for action in actions), dtype=np.intp, count=len(actions)) + reach
+        cols = np.fromiter((action[1] for action in actions), dtype=np.intp, count=len(actions)) + reach
+
+        longest = {}
+        for player in (self.current_player, 3 - self.current_player):
+            best = np.ones(len(actions), dtype=np.int64)
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                line = np.ones(len(actions), dtype=np.int64)
+                for sign in (1, -1):
+                    connected = np.ones(len(actions), dtype=bool)
+                    for step in range(1, reach + 1):
+                        connected &= padded[rows + sign * step * dr, cols + sign * step * dc] == player
+                        line += connected
+                best = np.maximum(best, line)
+            longest[player] = np.minimum(best, self.win_length)
+
+        neighbors = np.zeros(len(actions))
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                if dr or dc:
+                    neighbors += padded[rows + dr, cols + dc] != 0
+        # 连子每长一格分数乘8，对方同长度的连子按己方的一半计，棋子数只在连子长度相同时区分
+        own = 8.0 ** (longest[self.current_player] - 1)
+        opponent = 0.5 * 8.0 ** (longest[3 - self.current_player] - 1)
+        own[longest[self.current_player] >= self.win_length] *= 8
+        return own + opponent + neighbors / 8
+    
     def get_action_space(self):
         """获取动作空间"""
         return [(i, j) for i in range(self.board_size) for j in range(self.board_size)]
@@ -125,10 +265,81 @@ class GomokuGame(BaseGame):
         row, col = action
         return (0 <= row < self.board_size and 
                 0 <= col < self.board_size and 
-                self.board[row, col] == 0)
+                self._is_empty(row, col))
+    
+    def _is_empty(self, row: int, col: int) -> bool:
+        """检查格子是否为空"""
+        return (row, col) in self._empty
+    
+    def _store_stones(self, board: np.ndarray):
+        """把numpy棋盘写入棋子存储（不更新空格索引等派生状态）"""
+        self._board = np.array(board, dtype=int)
+    
+    def _load_board(self, board: np.ndarray):
+        """
+        加载局面：写入棋子并重建空格索引、候选点、哈希和胜负，各后端共用
+
+        轮到哪方由双方棋子数推断（玩家1先行）；之前的历史和撤销记录清空
+        """
+        board = np.asarray(board)
+        if board.shape != (self.board_size, self.board_size) or not np.isin(board, (0, 1, 2)).all():
+            raise ValueError(f"棋盘必须为{self.board_size}x{self.board_size}且只含0、1、2")
+        self._store_stones(board)
+        stones = [(int(row), int(col), int(board[row, col])) for row, col in zip(*np.nonzero(board))]
+        self._empty = CellIndex((int(row), int(col)) for row, col in zip(*np.nonzero(board == 0)))
+        self._candidates = CellIndex()
+        self._near_count = [0] * (self.board_size * self.board_size)
+        self._hash = 0
+        for row, col, player in stones:
+            self._add_neighborhood(row, col)
+            self._hash ^= self._stone_key(row, col, player)
+        self.winner = None
+        for row, col, player in stones:
+            if self._check_win(row, col, player):
+                self.winner = player
+                break
+        self.move_count = len(stones)
+        self.current_player = 1 if (board == 1).sum() <= (board == 2).sum() else 2
+        self.history = []
+        self._undo_stack = []
+    
+    def _place_stone(self, row: int, col: int, player: int):
+        """在棋盘上落子（不做合法性检查）"""
+        self._board[row, col] = player
+    
+    def _remove_stone(self, row: int, col: int):
+        """移除棋子"""
+        self._board[row, col] = 0
+    
+    def _add_neighborhood(self, row: int, col: int):
+        """落子后更新候选点：周围格子计数加一，新进入范围的空格成为候选"""
+        near_count = self._near_count
+        self._candidates.discard((row, col))
+        for cell, index in self._neighborhoods[row * self.board_size + col]:
+            near_count[index] += 1
+            if near_count[index] == 1 and cell in self._empty:
+                self._candidates.add(cell)
+    
+    def _remove_neighborhood(self, row: int, col: int):
+        """提子后恢复候选点，是_add_neighborhood的逆操作"""
+        near_count = self._near_count
+        for cell, index in self._neighborhoods[row * self.board_size + col]:
+            near_count[index] -= 1
+            if near_count[index] == 0:
+                self._candidates.discard(cell)
+        if near_count[row * self.board_size + col] > 0:
+            self._candidates.add((row, col))
+    
+    def _stone_key(self, row: int, col: int, player: int) -> int:
+        """某方在(row, col)处棋子的Zobrist键"""
+        return self._stone_keys[((player - 1) * self.board_size + row) * self.board_size + col]
+    
+    def _clone_stones(self, new_game: 'GomokuGame'):
+        """把棋子存储复制给克隆对象"""
+        new_game._board = self._board.copy()
     
     def _check_win(self, row: int, col: int, player: int) -> bool:
-        """检查是否获胜"""
+        """检查(row, col)处的棋子是否构成五连，只沿四个方向扫描O(L)个格子"""
         directions = [
             [(0, 1), (0, -1)],   # 水平
             [(1, 0), (-1, 0)],   # 垂直
@@ -136,6 +347,7 @@ class GomokuGame(BaseGame):
             [(1, -1), (-1, 1)]   # 副对角线
         ]
         
+        board = self._board
         for dir_pair in directions:
             count = 1  # 当前位置算一个
             
@@ -143,7 +355,7 @@ class GomokuGame(BaseGame):
                 r, c = row + dr, col + dc
                 while (0 <= r < self.board_size and 
                        0 <= c < self.board_size and 
-                       self.board[r, c] == player):
+                       board[r, c] == player):
                     count += 1
                     r += dr
                     c += dc
@@ -155,7 +367,7 @@ class GomokuGame(BaseGame):
     
     def _is_board_full(self) -> bool:
         """检查棋盘是否已满"""
-        return np.all(self.board != 0)
+        return len(self._empty) == 0
     
     def get_board_string(self) -> str:
         """获取棋盘字符串表示"""
@@ -1,4 +1,9 @@
 from .snake_game import SnakeGame
 from .snake_env import SnakeEnv
+from .batch_snake import BatchSnakeGame
+from .arena import SnakeArena
+from .distance_field import DistanceField, get_distance_field
+from .territory import flood_fill, evaluate_actions
  
-__all__ = ['SnakeGame', 'SnakeEnv'] 
\ No newline at end of file
+__all__ = ['SnakeGame', 'SnakeEnv', 'BatchSnakeGame', 'SnakeArena', 'DistanceField', 'get_distance_field',
+           'flood_fill', 'evaluate_actions'] 
\ No newline at end of file
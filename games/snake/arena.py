@@ -0,0 +1,272 @@
+"""
+多蛇竞技场
+任意数量的蛇在同一张大棋盘上同时移动，用于拥挤环境下的压力测试
+"""
+
+import math
+import random
+import numpy as np
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from ..base_game import BaseGame
+from ..cell_index import CellIndex
+import config
+
+
+@lru_cache(maxsize=None)
+def _all_cells(board_size: int) -> CellIndex:
+    """包含全部格子的索引模板，重置时复制，避免大棋盘上逐格重建"""
+    return CellIndex((x, y) for x in range(board_size) for y in range(board_size))
+
+
+class SnakeArena(BaseGame):
+    """N条蛇的贪吃蛇竞技场，所有蛇每个tick同时移动"""
+
+    # 棋盘格子取值：0为空，p为玩家p的蛇身（含蛇头），FOOD_CELL为食物
+    FOOD_CELL = -1
+
+    # 支持的最大棋盘边长
+    MAX_BOARD_SIZE = 200
+
+    DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+    def __init__(self, num_snakes: int = 4, board_size: int = 50, food_count: Optional[int] = None,
+                 seed: Optional[int] = None):
+        if num_snakes < 1:
+            raise ValueError(f"蛇的数量必须为正数: {num_snakes}")
+        if not 4 <= board_size <= self.MAX_BOARD_SIZE:
+            raise ValueError(f"棋盘边长必须在4到{self.MAX_BOARD_SIZE}之间: {board_size}")
+        # 出生点排成网格，相邻出生点至少相隔2格
+        self._grid = math.ceil(math.sqrt(num_snakes))
+        self._spacing = board_size // (self._grid + 1)
+        if self._spacing < 2:
+            raise ValueError(f"{board_size}x{board_size}的棋盘放不下{num_snakes}条蛇")
+
+        game_config = {
+            'board_size': board_size,
+            'num_snakes': num_snakes,
+            'food_count': food_count,
+            'timeout': config.GAME_CONFIGS['snake']['timeout'],
+            'max_moves': config.GAME_CONFIGS['snake']['max_moves']
+        }
+        self.num_players = num_snakes
+        self.board_size = board_size
+        self.food_count = num_snakes if food_count is None else food_count
+        self.rng = random.Random(seed)
+        super().__init__(game_config)
+
+    def reset(self) -> Dict[str, Any]:
+        """重置游戏状态"""
+        size = self.board_size
+        # 所有蛇共用一张占用网格，碰撞检查O(1)；空闲格索引用于O(1)抽取食物位置
+        self.board = np.zeros((size, size), dtype=np.int16)
+        self._free = _all_cells(size).copy()
+        self.snakes = []
+        self.directions = []
+        self.alive = [True] * self.num_players
+        self.alive_count = self.num_players
+        self.foods = set()
+
+        for i in range(self.num_players):
+            head = ((i // self._grid + 1) * self._spacing, (i % self._grid + 1) * self._spacing)
+            self.snakes.append(deque([head]))
+            # 相邻两列的蛇背向出发
+            self.directions.append((0, 1) if i % 2 == 0 else (0, -1))
+            self._set_cell(head, i + 1)
+        self._generate_foods()
+
+        self.current_player = 1
+        self.game_state = config.GameState.ONGOING
+        self.move_count = 0
+        self.history = []
+        self._undo_stack = []
+        return self.get_state()
+
+    def step(self, actions: Sequence[Optional[Tuple[int, int]]]) -> Tuple[Dict[str, Any], np.ndarray, bool, Dict[str, Any]]:
+        """
+        所有蛇同时移动一个tick
+
+        Args:
+            actions: 每条蛇的方向 (dx, dy)，None表示保持原方向；已死亡的蛇忽略
+
+        Returns:
+            observation: 观察状态
+            reward: (N,) 每条蛇的奖励，本tick死亡-1，结束时唯一存活者1，其余0
+            done: 是否结束
+            info: 'died' 本tick死亡的玩家列表，'alive_count' 存活数量
+        """
+        self.apply(actions)
+        died = [i + 1 for i in self._undo_stack[-1][1]]
+        done = self.is_terminal()
+
+        reward = np.zeros(self.num_players, dtype=np.float32)
+        for player in died:
+            reward[player - 1] = -1
+        winner = self.get_winner()
+        if winner is not None:
+            reward[winner - 1] = 1
+
+        info = {'died': died, 'alive_count': self.alive_count}
+        return self.get_state(), reward, done, info
+
+    def apply(self, actions: Sequence[Optional[Tuple[int, int]]]) -> None:
+        """
+        推进一个tick并压入撤销记录，不构造观察和奖励
+
+        先按移动前的棋盘判定死亡（出界、撞到任一蛇身含蛇尾、多个蛇头进入同一格），
+        再移动存活的蛇，最后补充食物，因此结果与蛇的处理顺序无关
+        """
+        size = self.board_size
+        board = self.board
+        directions = list(self.directions)
+        targets = {}
+        arrivals = {}
+        for i, snake in enumerate(self.snakes):
+            if not self.alive[i]:
+                continue
+            if actions[i] is not None:
+                self.directions[i] = actions[i]
+            head = snake[0]
+            direction = self.directions[i]
+            target = (head[0] + direction[0], head[1] + direction[1])
+            targets[i] = target
+            arrivals[target] = arrivals.get(target, 0) + 1
+
+        died = []
+        for i, target in targets.items():
+            if (target[0] < 0 or target[0] >= size or target[1] < 0 or target[1] >= size or
+                    board[target] > 0 or arrivals[target] > 1):
+                died.append(i)
+        for i in died:
+            del targets[i]
+            self.alive[i] = False
+        self.alive_count -= len(died)
+
+        # 每条移动的蛇记录(编号, 移走的蛇尾)，吃到食物时蛇尾为None
+        moves = []
+        ate = False
+        for i, target in targets.items():
+            snake = self.snakes[i]
+            snake.appendleft(target)
+            if target in self.foods:
+                self.foods.remove(target)
+                board[target] = i + 1  # 食物格不在空闲格索引中
+                moves.append((i, None))
+                ate = True
+            else:
+                self._set_cell(target, i + 1)
+                tail = snake.pop()
+                self._set_cell(tail, 0)
+                moves.append((i, tail))
+        spawned = self._generate_foods() if ate else []
+
+        self.move_count += 1
+        self._undo_stack.append((directions, died, moves, spawned))
+
+    def undo(self) -> None:
+        """撤销最近一次apply（或step），恢复方向、存活状态、蛇身和食物"""
+        directions, died, moves, spawned = self._undo_stack.pop()
+        # 新食物最后生成，最先移除（可能落在本tick腾出的蛇尾格）
+        for pos in spawned:
+            self.foods.remove(pos)
+            self._set_cell(pos, 0)
+        for i, tail in reversed(moves):
+            snake = self.snakes[i]
+            head = snake.popleft()
+            if tail is None:
+                self.foods.add(head)
+                self._set_cell(head, self.FOOD_CELL)
+            else:
+                self._set_cell(head, 0)
+                snake.append(tail)
+                self._set_cell(tail, i + 1)
+        for i in died:
+            self.alive[i] = True
+        self.alive_count += len(died)
+        self.directions = directions
+        self.move_count -= 1
+
+    def get_valid_actions(self, player: int = None) -> List[Tuple[int, int]]:
+        """获取有效动作列表（不能掉头）"""
+        if player is None:
+            player = self.current_player
+        dx, dy = self.directions[player - 1]
+        return [d for d in self.DIRECTIONS if d != (-dx, -dy)]
+
+    def is_occupied(self, pos: Tuple[int, int]) -> bool:
+        """O(1)检查界内格子是否被任一条蛇占据"""
+        return self.board[pos] > 0
+
+    def is_terminal(self) -> bool:
+        """至多剩一条蛇（单蛇时蛇死亡）时结束"""
+        return self.alive_count == 0 or (self.num_players > 1 and self.alive_count == 1)
+
+    def get_winner(self) -> Optional[int]:
+        """获取获胜者：结束时唯一存活的蛇，全部死亡时为None"""
+        if self.num_players > 1 and self.alive_count == 1:
+            return self.alive.index(True) + 1
+        return None
+
+    def get_state(self) -> Dict[str, Any]:
+        """获取当前游戏状态（棋盘为只读视图，随游戏继续而变化）"""
+        board = self.board.view()
+        board.flags.writeable = False
+        return {
+            'board': board,
+            'heads': [snake[0] for snake in self.snakes],
+            'lengths': [len(snake) for snake in self.snakes],
+            'directions': list(self.directions),
+            'alive': list(self.alive),
+            'foods': list(self.foods),
+            'game_state': self.game_state,
+            'move_count': self.move_count
+        }
+
+    def render(self) -> np.ndarray:
+        """渲染游戏画面"""
+        return self.get_state()['board']
+
+    def clone(self) -> 'SnakeArena':
+        """克隆游戏状态：只复制可变状态，配置与原对象共享"""
+        cloned_game = self._shallow_clone()
+        cloned_game.board = self.board.copy()
+        cloned_game._free = self._free.copy()
+        cloned_game.snakes = [snake.copy() for snake in self.snakes]
+        cloned_game.directions = list(self.directions)
+        cloned_game.alive = list(self.alive)
+        cloned_game.foods = set(self.foods)
+        cloned_game.rng = random.Random()
+        cloned_game.rng.setstate(self.rng.getstate())
+        cloned_game.history = self.history.copy()
+        return cloned_game
+
+    def get_action_space(self):
+        """获取动作空间"""
+        return list(self.DIRECTIONS)
+
+    def get_observation_space(self):
+        """获取观察空间"""
+        return {
+            'board': (self.board_size, self.board_size),
+            'heads': (self.num_players, 2),
+        }
+
+    def _generate_foods(self) -> List[Tuple[int, int]]:
+        """在空闲格中均匀随机生成食物，棋盘没有空闲格时停止，返回新生成的食物"""
+        spawned = []
+        while len(self.foods) < self.food_count and len(self._free) > 0:
+            pos = self._free.sample(self.rng)
+            self.foods.add(pos)
+            self._set_cell(pos, self.FOOD_CELL)
+            spawned.append(pos)
+        return spawned
+
+    def _set_cell(self, pos: Tuple[int, int], value: int):
+        """写入棋盘格子并同步空闲格索引"""
+        if self.board[pos] == 0:
+            if value != 0:
+                self._free.remove(pos)
+        elif value == 0:
+            self._free.add(pos)
+        self.board[pos] = value
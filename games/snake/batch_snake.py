@@ -0,0 +1,206 @@
+"""
+批量贪吃蛇模拟器
+把N局双人贪吃蛇存放在numpy数组中，一次调用同时推进所有对局一个tick
+规则与 SnakeGame(simultaneous=True) 相同
+"""
+
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+from games.snake.snake_game import SnakeGame
+import config
+
+
+class BatchSnakeGame:
+    """N局双人贪吃蛇的向量化模拟器，用于大量随机对局和强化学习采样"""
+
+    # 动作下标与 SnakeGame.get_action_space() 的顺序一致：上、下、左、右
+    ACTIONS = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)], dtype=np.int64)
+    # 每个方向之外的三个非掉头动作（掉头为 下标 ^ 1）
+    _NON_REVERSE = np.array([[a for a in range(4) if a != d ^ 1] for d in range(4)], dtype=np.int64)
+    FOOD_CELL = SnakeGame.FOOD_CELL
+
+    def __init__(self, num_games: int, board_size: int = 20, food_count: int = 5,
+                 seed: Optional[int] = None, auto_reset: bool = True,
+                 max_ticks: Optional[int] = None):
+        self.num_games = num_games
+        self.board_size = board_size
+        self.food_count = food_count
+        self.rng = np.random.default_rng(seed)
+        # 结束的对局在step末尾自动重置
+        self.auto_reset = auto_reset
+        # 超过该tick数的对局按结束处理，避免单条蛇永远绕圈
+        self.max_ticks = max_ticks or config.GAME_CONFIGS['snake']['max_moves']
+
+        cells = board_size * board_size
+        # 棋盘格子取值与SnakeGame相同：玩家p的蛇头为2p-1，蛇身为2p，食物为FOOD_CELL
+        self.boards = np.zeros((num_games, board_size, board_size), dtype=np.int8)
+        self._flat = self.boards.reshape(num_games, cells)
+        # 环形缓冲区存放蛇身（展平下标），head_ptr指向蛇头，尾部在head_ptr-length+1
+        self.bodies = np.zeros((num_games, 2, cells), dtype=np.int32)
+        self.head_ptr = np.zeros((num_games, 2), dtype=np.int32)
+        self.length = np.zeros((num_games, 2), dtype=np.int32)
+        self.directions = np.zeros((num_games, 2), dtype=np.int64)
+        self.alive = np.zeros((num_games, 2), dtype=bool)
+        self.food_left = np.zeros(num_games, dtype=np.int32)
+        self.ticks = np.zeros(num_games, dtype=np.int32)
+        self.done = np.zeros(num_games, dtype=bool)
+        self.winner = np.zeros(num_games, dtype=np.int8)  # 0表示无人获胜
+
+        self._games = np.arange(num_games)
+        self.reset()
+
+    @classmethod
+    def from_game(cls, game: SnakeGame, num_games: int, seed: Optional[int] = None,
+                  **kwargs) -> 'BatchSnakeGame':
+        """把一个SnakeGame局面复制为num_games局（之后的食物随机生成各不相同）"""
+        batch = cls(num_games, game.board_size, game.food_count, seed, **kwargs)
+        batch.boards[:] = game.board
+        batch.bodies[:] = 0
+        for p, snake in enumerate((game.snake1, game.snake2)):
+            # 蛇头放在length-1处，蛇身依次向前
+            cells = [row * game.board_size + col for row, col in reversed(snake)]
+            batch.bodies[:, p, :len(cells)] = cells
+            batch.head_ptr[:, p] = len(cells) - 1
+            batch.length[:, p] = len(cells)
+        actions = [tuple(a) for a in cls.ACTIONS.tolist()]
+        batch.directions[:] = (actions.index(game.direction1), actions.index(game.direction2))
+        batch.alive[:] = (game.alive1, game.alive2)
+        batch.food_left[:] = len(game.foods)
+        batch.ticks[:] = 0
+        batch.done[:] = game.is_terminal()
+        batch.winner[:] = 0
+        return batch
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """重置全部对局，或只重置mask为True的对局"""
+        if mask is None:
+            mask = np.ones(self.num_games, dtype=bool)
+        games = np.flatnonzero(mask)
+        size = self.board_size
+        center = size // 2
+        starts = np.array([center * size + center - 2, center * size + center + 2])
+
+        self._flat[games] = 0
+        self.bodies[games] = 0
+        self.bodies[games, :, 0] = starts
+        self.head_ptr[games] = 0
+        self.length[games] = 1
+        self.directions[games] = (3, 2)  # 玩家1向右，玩家2向左
+        self.alive[games] = True
+        self._flat[games[:, None], starts] = (1, 3)
+        self.food_left[games] = 0
+        self.ticks[games] = 0
+        self.done[games] = False
+        self.winner[games] = 0
+        self._generate_foods(games)
+        return self.boards
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """
+        所有未结束的对局同时推进一个tick
+
+        Args:
+            actions: (N, 2) 两名玩家的动作下标（见ACTIONS），已死亡的蛇忽略对应动作
+
+        Returns:
+            observation: 所有棋盘 (N, S, S)；开启auto_reset时结束的对局已被重置
+            reward: (N, 2) 每名玩家的奖励，与SnakeGame一致：自己已死亡-1、仅对手死亡1，其余0
+            done: 每局是否在本tick结束
+            info: 'winner' 本tick结束的对局的获胜者（活得更久的一方，0为无），
+                  'length' (N, 2) 重置前的蛇长
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        size = self.board_size
+        cells = size * size
+        games = self._games
+        moving = self.alive & ~self.done[:, None]
+        self.directions[moving] = actions[moving]
+
+        # 计算新头部，先按tick开始时的棋盘判定死亡，结果与处理顺序无关
+        heads = self.bodies[games[:, None], (0, 1), self.head_ptr]
+        rows, cols = np.divmod(heads, size)
+        moves = self.ACTIONS[self.directions]
+        rows = rows + moves[..., 0]
+        cols = cols + moves[..., 1]
+        inside = (rows >= 0) & (rows < size) & (cols >= 0) & (cols < size)
+        targets = np.where(inside, rows * size + cols, 0)
+        target_cells = self._flat[games[:, None], targets]
+        blocked = ~inside | ((target_cells > 0) & (target_cells < self.FOOD_CELL))
+        head_on = (moving & inside).all(axis=1) & (targets[:, 0] == targets[:, 1])
+        dies = moving & (blocked | head_on[:, None])
+        movers = moving & ~dies
+        ate = movers & (target_cells == self.FOOD_CELL)
+
+        # 移动存活的蛇：旧头部变为蛇身，未吃到食物的移走尾部，最后写入新头部
+        g, p = np.nonzero(movers)
+        self._flat[g, heads[g, p]] = 2 * p + 2
+        grow = ate[g, p]
+        tails = self.bodies[g, p, (self.head_ptr[g, p] - self.length[g, p] + 1) % cells]
+        self._flat[g[~grow], tails[~grow]] = 0
+        self.head_ptr[g, p] = (self.head_ptr[g, p] + 1) % cells
+        self.bodies[g, p, self.head_ptr[g, p]] = targets[g, p]
+        self._flat[g, targets[g, p]] = 2 * p + 1
+        self.length[g, p] += grow
+        self.food_left -= ate.sum(axis=1, dtype=np.int32)
+        self._generate_foods(np.flatnonzero(ate.any(axis=1)))
+
+        # 一方先死时另一方获胜；同一tick死亡或超时不改变获胜者
+        was_alive = self.alive.copy()
+        self.alive &= ~dies
+        outlived = (self.winner == 0) & was_alive.all(axis=1) & (self.alive.sum(axis=1) == 1)
+        self.winner[outlived] = self.alive[outlived, 1] + 1
+
+        active = ~self.done
+        reward = np.zeros((self.num_games, 2), dtype=np.float32)
+        reward[active[:, None] & self.alive & ~self.alive[:, ::-1]] = 1
+        reward[active[:, None] & ~self.alive] = -1
+        self.ticks[active] += 1
+        finished = active & (~self.alive.any(axis=1) | (self.ticks >= self.max_ticks))
+        self.done |= finished
+
+        info = {'winner': np.where(finished, self.winner, 0), 'length': self.length.copy()}
+        if self.auto_reset and finished.any():
+            self.reset(finished)
+        return self.boards, reward, finished, info
+
+    def random_actions(self) -> np.ndarray:
+        """为每条蛇均匀随机选一个非掉头动作，返回 (N, 2)"""
+        choice = self.rng.integers(0, 3, size=(self.num_games, 2))
+        return self._NON_REVERSE[self.directions, choice]
+
+    def play_random(self, num_ticks: int) -> np.ndarray:
+        """随机推进num_ticks个tick，返回各局结束次数 (N,)"""
+        finished = np.zeros(self.num_games, dtype=np.int64)
+        for _ in range(num_ticks):
+            _, _, done, _ = self.step(self.random_actions())
+            finished += done
+        return finished
+
+    def _generate_foods(self, games: np.ndarray, max_rejections: int = 8):
+        """
+        为给定对局补充食物直到food_count个
+
+        先整体随机抽格子，只对抽到非空格的对局重抽；重抽max_rejections轮后
+        仍未成功的对局改用空格掩码抽样，棋盘没有空格时停止
+        """
+        cells = self.board_size * self.board_size
+        pending = games[self.food_left[games] < self.food_count]
+        while len(pending) > 0:
+            for _ in range(max_rejections):
+                picks = self.rng.integers(0, cells, len(pending))
+                free = self._flat[pending, picks] == 0
+                self._flat[pending[free], picks[free]] = self.FOOD_CELL
+                self.food_left[pending[free]] += 1
+                pending = pending[self.food_left[pending] < self.food_count]
+                if len(pending) == 0:
+                    return
+
+            empty = self._flat[pending] == 0
+            pending = pending[empty.any(axis=1)]
+            empty = empty[empty.any(axis=1)]
+            if len(pending) == 0:
+                return
+            picks = np.where(empty, self.rng.random(empty.shape), -1.0).argmax(axis=1)
+            self._flat[pending, picks] = self.FOOD_CELL
+            self.food_left[pending] += 1
+            pending = pending[self.food_left[pending] < self.food_count]
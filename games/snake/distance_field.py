@@ -0,0 +1,178 @@
+"""
+贪吃蛇距离场
+对一个局面做广度优先搜索，得到每个蛇头到各格子的距离和各格子到最近食物的距离，
+按释放时间、蛇头和食物缓存，同一tick内多个智能体、多次查询共用一份结果
+"""
+
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import numpy as np
+from games.snake.territory import release_times
+
+# 缓存最近若干个局面的距离场
+FIELD_CACHE_SIZE = 16
+_field_cache = OrderedDict()
+
+
+@lru_cache(maxsize=None)
+def _neighbors(board_size: int) -> Tuple[Tuple[int, ...], ...]:
+    """每个格子（展平下标）的界内四邻格"""
+    neighbors = []
+    for row in range(board_size):
+        for col in range(board_size):
+            cells = []
+            for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                x, y = row + dx, col + dy
+                if 0 <= x < board_size and 0 <= y < board_size:
+                    cells.append(x * board_size + y)
+            neighbors.append(tuple(cells))
+    return tuple(neighbors)
+
+
+class DistanceField:
+    """
+    一个贪吃蛇局面的距离场
+
+    碰撞按移动前的棋盘判定，所以下一步的安全判断中蛇尾和其余蛇身一样是障碍。
+    蛇头出发的距离按释放时间（见 territory.release_times）考虑蛇身随时间移走：第d步可以进入
+    释放时间不超过d的格子；到食物的距离不区分先后，全部蛇身都是障碍。
+    各距离在首次查询时计算，不可达的格子距离为-1
+    """
+
+    def __init__(self, game, release: np.ndarray = None):
+        """
+        Args:
+            game: SnakeGame
+            release: 已算好的 release_times(game)，None时在此计算
+        """
+        self.board_size = game.board_size
+        self.heads = {}
+        for player, snake in ((1, game.snake1), (2, game.snake2)):
+            if snake:
+                self.heads[player] = snake[0]
+        # 各格子的释放时间快照，0为空格或食物；展平列表在第一次广度优先搜索时再生成
+        self._release = release_times(game) if release is None else release
+        self._release_list = None
+        self.foods = list(game.foods)
+        self._head_distances = {}
+        self._food_distances = None
+
+    def is_safe(self, pos: Tuple[int, int]) -> bool:
+        """格子是否在界内且不被蛇身（含蛇尾）占据，即下一步能否安全进入"""
+        if not (0 <= pos[0] < self.board_size and 0 <= pos[1] < self.board_size):
+            return False
+        return self._release[pos] == 0
+
+    def head_distances(self, player: int) -> np.ndarray:
+        """玩家蛇头到各格子的步数 (S, S)"""
+        return self._to_array(self._head_field(player))
+
+    def food_distances(self) -> np.ndarray:
+        """各格子到最近食物的步数 (S, S)"""
+        return self._to_array(self._food_field())
+
+    def distance(self, player: int, pos: Tuple[int, int]) -> int:
+        """玩家蛇头到格子的步数，不可达时为-1"""
+        return self._head_field(player)[pos[0] * self.board_size + pos[1]]
+
+    def distance_to_food(self, player: int) -> Optional[int]:
+        """玩家蛇头到最近可达食物的步数，没有可达食物时返回None"""
+        best = self._best_step(player)
+        return None if best is None else best[0] + 1
+
+    def next_step_to_food(self, player: int) -> Optional[Tuple[int, int]]:
+        """沿最短路径走向最近可达食物的第一步方向 (dx, dy)，没有可达食物时返回None"""
+        best = self._best_step(player)
+        return None if best is None else best[1]
+
+    def safe_actions(self, player: int, actions: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """下一步不会出界或撞到蛇身（含蛇尾）的动作"""
+        head = self.heads[player]
+        return [action for action in actions
+                if self.is_safe((head[0] + action[0], head[1] + action[1]))]
+
+    def _best_step(self, player: int) -> Optional[Tuple[int, Tuple[int, int]]]:
+        """蛇头相邻格中到最近食物最近的一格：(该格到食物的步数, 方向)"""
+        if player not in self.heads:
+            return None
+        head = self.heads[player]
+        distances = self._food_field()
+        best = None
+        for action in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            pos = (head[0] + action[0], head[1] + action[1])
+            if self.is_safe(pos):
+                distance = distances[pos[0] * self.board_size + pos[1]]
+                if distance >= 0 and (best is None or distance < best[0]):
+                    best = (distance, action)
+        return best
+
+    def _head_field(self, player: int) -> List[int]:
+        """蛇头出发的距离（展平列表），首次查询时计算"""
+        if player not in self._head_distances:
+            head = self.heads[player]
+            self._head_distances[player] = self._bfs([head[0] * self.board_size + head[1]], timed=True)
+        return self._head_distances[player]
+
+    def _food_field(self) -> List[int]:
+        """到最近食物的距离（展平列表），以全部食物为源的多源广度优先搜索"""
+        if self._food_distances is None:
+            sources = [x * self.board_size + y for x, y in self.foods]
+            self._food_distances = self._bfs(sources)
+        return self._food_distances
+
+    def _release_cells(self) -> List[int]:
+        """各格子（展平下标）的释放时间；广度优先搜索逐格查询，列表比numpy下标快"""
+        if self._release_list is None:
+            self._release_list = self._release.ravel().tolist()
+        return self._release_list
+
+    def _to_array(self, distances: List[int]) -> np.ndarray:
+        """展平距离列表转为 (S, S) 数组"""
+        return np.array(distances, dtype=np.int32).reshape(self.board_size, self.board_size)
+
+    def _bfs(self, sources: List[int], timed: bool = False) -> List[int]:
+        """
+        从sources（展平下标）出发、绕开蛇身的广度优先搜索
+
+        timed为True时第d步可以进入释放时间不超过d的蛇身格子，否则蛇身始终是障碍
+        """
+        size = self.board_size * self.board_size
+        distances = [-1] * size
+        for cell in sources:
+            distances[cell] = 0
+        queue = deque(sources)
+        neighbors = _neighbors(self.board_size)
+        release = self._release_cells()
+        while queue:
+            cell = queue.popleft()
+            step = distances[cell] + 1
+            limit = step if timed else 0
+            for neighbor in neighbors[cell]:
+                if distances[neighbor] < 0 and release[neighbor] <= limit:
+                    distances[neighbor] = step
+                    queue.append(neighbor)
+        return distances
+
+
+def get_distance_field(game) -> DistanceField:
+    """
+    获取局面的距离场，释放时间、蛇头和食物都相同的局面直接返回缓存结果
+
+    Args:
+        game: SnakeGame
+    """
+    # 距离只取决于这些输入，与轮到哪方走无关，两名玩家查询同一个tick时命中同一项；
+    # 释放时间按蛇身顺序区分各节，蛇身格子相同而蛇尾不同的局面不会共用一项
+    release = release_times(game)
+    heads = tuple(snake[0] if snake else None for snake in (game.snake1, game.snake2))
+    key = (game.board_size, release.tobytes(), heads, frozenset(game.foods))
+    field = _field_cache.get(key)
+    if field is None:
+        field = DistanceField(game, release)
+        _field_cache[key] = field
+        if len(_field_cache) > FIELD_CACHE_SIZE:
+            _field_cache.popitem(last=False)
+    else:
+        _field_cache.move_to_end(key)
+    return field
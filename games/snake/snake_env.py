@@ -12,9 +12,14 @@ from games.snake.snake_game import SnakeGame
 class SnakeEnv(BaseEnv):
     """贪吃蛇环境"""
     
-    def __init__(self, board_size=20, **kwargs):
+    def __init__(self, board_size=20, simultaneous=False, **kwargs):
         self.board_size = board_size
-        self.game = SnakeGame(board_size)
+        # 同时模式下step接收((dx1, dy1), (dx2, dy2))，一次推进两条蛇。
+        # get_valid_actions()此时返回全部联合动作，通用智能体直接从中选择；
+        # 贪吃蛇专用智能体用get_valid_actions(player_id)只为自己的蛇选方向，
+        # 搜索智能体（MCTSBot、MinimaxBot）在联合动作上搜索后也只返回己方方向，由调用方组合成联合动作
+        self.simultaneous = simultaneous
+        self.game = SnakeGame(board_size, simultaneous=simultaneous)
         super().__init__(self.game)
 
     def _setup_spaces(self):
@@ -23,17 +28,17 @@ class SnakeEnv(BaseEnv):
         self.action_space = None
 
     def _get_observation(self):
-        """获取观察"""
-        return self.game.board.copy()
+        """获取观察（棋盘的只读视图，需要保存时请自行copy）"""
+        return self.game.get_board()
 
     def _get_action_mask(self):
         """获取动作掩码"""
         # 贪吃蛇所有方向都可能有效，但要避免直接掉头
         return np.ones(4, dtype=bool)  # [up, down, left, right]
 
-    def get_valid_actions(self):
-        """获取有效动作"""
-        return self.game.get_valid_actions()
+    def get_valid_actions(self, player=None):
+        """获取有效动作：同时模式下不指定player时为联合动作，指定时为该玩家的方向"""
+        return self.game.get_valid_actions(player)
 
     def is_terminal(self):
         """检查游戏是否结束"""
@@ -47,11 +52,11 @@ class SnakeEnv(BaseEnv):
         """渲染环境"""
         if mode == 'human':
             self.game.render()
-        return self.game.board.copy()
+        return self.game.get_board(copy=True)
 
     def get_board_state(self):
         """获取棋盘状态"""
-        return self.game.board.copy()
+        return self.game.get_board(copy=True)
 
     def get_snake_positions(self) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
         """获取蛇的位置"""
@@ -65,7 +70,7 @@ class SnakeEnv(BaseEnv):
     
     def is_valid_move(self, action: Tuple[int, int]) -> bool:
         """检查移动是否有效"""
-        return action in self.game.get_valid_actions()
+        return self.game.is_legal(action)
     
     def get_game_info(self) -> Dict[str, Any]:
         """获取游戏信息"""
@@ -83,7 +88,8 @@ class SnakeEnv(BaseEnv):
     
     def clone(self):
         """克隆环境"""
-        cloned_game = self.game.clone()
-        cloned_env = SnakeEnv(self.board_size)
-        cloned_env.game = cloned_game
+        # 不重新构造游戏，只克隆游戏状态，其余属性与原环境共享
+        cloned_env = object.__new__(self.__class__)
+        cloned_env.__dict__.update(self.__dict__)
+        cloned_env.game = self.game.clone()
         return cloned_env 
\ No newline at end of file
@@ -3,34 +3,57 @@
 """
 
 import numpy as np
-import random
+from collections import deque
 from typing import Dict, List, Tuple, Any, Optional
 from ..base_game import BaseGame
+from ..cell_index import CellIndex
+from ..zobrist import zobrist_keys, DEFAULT_SEED
 import config
 
 
 class SnakeGame(BaseGame):
     """双人贪吃蛇游戏"""
     
-    def __init__(self, board_size: int = 20, initial_length: int = 3, food_count: int = 5):
+    # Zobrist键分区：头1、头2、身1、身2、食物；蛇身按指向前一节（靠近蛇头）的方向再分四区，
+    # 因此哈希区分蛇身顺序
+    _FOOD_SLOT = 10
+    
+    # 方向在动作空间中的下标，用于蛇身分区和方向键
+    _DIRECTION_INDEX = {(-1, 0): 0, (1, 0): 1, (0, -1): 2, (0, 1): 3}
+    
+    # 棋盘格子取值：0为空，玩家p的蛇头为2p-1、蛇身为2p，食物为FOOD_CELL
+    FOOD_CELL = 5
+    
+    def __init__(self, board_size: int = 20, initial_length: int = 3, food_count: int = 5,
+                 zobrist_seed: int = DEFAULT_SEED, simultaneous: bool = False):
         game_config = {
             'board_size': board_size,
             'initial_length': initial_length,
             'food_count': food_count,
+            'simultaneous': simultaneous,
             'timeout': config.GAME_CONFIGS['snake']['timeout'],
             'max_moves': config.GAME_CONFIGS['snake']['max_moves']
         }
         
         
         self.board_size = board_size
-        self.board=np.zeros((board_size,board_size),dtype=int)
         self.initial_length = initial_length
         self.food_count = food_count
+        self.zobrist_seed = zobrist_seed
+        # 同时模式：一次step同时推进两条蛇，current_player始终为1
+        self.simultaneous = simultaneous
+        # 每个分区board_size²个格子键，之后是两条蛇的死亡键、轮到玩家2的键和两条蛇各四个方向键
+        cell_count = (self._FOOD_SLOT + 1) * board_size * board_size
+        keys = zobrist_keys(cell_count + 11, zobrist_seed)
+        self._cell_keys = keys[:cell_count]
+        self._dead_keys = (None, keys[cell_count], keys[cell_count + 1])
+        self._side_key = keys[cell_count + 2]
+        self._direction_keys = (None, keys[cell_count + 3:cell_count + 7], keys[cell_count + 7:])
         super().__init__(game_config)
 
-        # 蛇的位置和方向
-        self.snake1 = []  # 玩家1的蛇
-        self.snake2 = []  # 玩家2的蛇
+        # 蛇的位置和方向，蛇头在左端
+        self.snake1 = deque()  # 玩家1的蛇
+        self.snake2 = deque()  # 玩家2的蛇
         self.direction1 = (0, 1)  # 玩家1的方向
         self.direction2 = (0, -1)  # 玩家2的方向
         
@@ -45,10 +68,18 @@ class SnakeGame(BaseGame):
     
     def reset(self) -> Dict[str, Any]:
         """重置游戏状态"""
+        self._hash = 0
+        
         # 初始化蛇的位置
         center = self.board_size // 2
-        self.snake1 = [(center, center - 2)]
-        self.snake2 = [(center, center + 2)]
+        self.snake1 = deque([(center, center - 2)])
+        self.snake2 = deque([(center, center + 2)])
+        
+        # 棋盘随每步增量更新，碰撞和食物检查都是O(1)；空闲格索引用于O(1)抽取食物位置
+        self.board = np.zeros((self.board_size, self.board_size), dtype=int)
+        self._free = CellIndex((x, y) for x in range(self.board_size) for y in range(self.board_size))
+        self._set_cell(self.snake1[0], 1)
+        self._set_cell(self.snake2[0], 3)
         
         # 初始化方向
         self.direction1 = (0, 1)  # 向右
@@ -65,33 +96,26 @@ class SnakeGame(BaseGame):
         self.game_state = config.GameState.ONGOING
         self.move_count = 0
         self.history = []
+        self._undo_stack = []
+        self._hash = self._compute_hash()
         
         return self.get_state()
     
-    def step(self, action: Tuple[int, int]) -> Tuple[Dict[str, Any], float, bool, Dict[str, Any]]:
+    def step(self, action) -> Tuple[Dict[str, Any], float, bool, Dict[str, Any]]:
         """
         执行一步动作
         
         Args:
-            action: (dx, dy) 方向向量
+            action: (dx, dy) 方向向量；同时模式下为两名玩家的方向 ((dx1, dy1), (dx2, dy2))
             
         Returns:
             observation: 观察状态
-            reward: 奖励
+            reward: 奖励（同时模式下为玩家1的奖励）
             done: 是否结束
             info: 额外信息
         """
-        # 更新方向
-        if self.current_player == 1:
-            self.direction1 = action
-        else:
-            self.direction2 = action
-        
-        # 移动蛇
-        if self.current_player == 1 and self.alive1:
-            self._move_snake(1)
-        elif self.current_player == 2 and self.alive2:
-            self._move_snake(2)
+        # 更新方向并移动蛇
+        self.apply(action)
         
         # 检查游戏结束条件
         done = self._check_game_over()
@@ -113,8 +137,78 @@ class SnakeGame(BaseGame):
         
         return observation, reward, done, info
     
+    def apply(self, action) -> None:
+        """
+        推进一步，可用undo撤销
+        
+        Args:
+            action: 轮流模式下为当前玩家的方向；同时模式下为(玩家1方向, 玩家2方向)
+        """
+        if self.simultaneous:
+            self._undo_stack.append(self._tick(((1, action[0]), (2, action[1]))))
+        else:
+            self._undo_stack.append(self._tick(((self.current_player, action),)))
+    
+    def undo(self) -> None:
+        """撤销最近一次apply，恢复方向、存活状态、蛇身和食物"""
+        records, spawned = self._undo_stack.pop()
+        # 新食物最后生成，最先移除（可能落在本步腾出的蛇尾格）
+        if spawned:
+            for food in self.foods[-spawned:]:
+                self._set_cell(food, 0)
+                self._hash ^= self._cell_key(self._FOOD_SLOT, food)
+            del self.foods[-spawned:]
+        for player, direction, alive, move in reversed(records):
+            if player == 1:
+                was_alive = self.alive1
+                self._hash ^= self._direction_key(1, self.direction1) ^ self._direction_key(1, direction)
+                self.direction1 = direction
+                self.alive1 = alive
+                snake = self.snake1
+            else:
+                was_alive = self.alive2
+                self._hash ^= self._direction_key(2, self.direction2) ^ self._direction_key(2, direction)
+                self.direction2 = direction
+                self.alive2 = alive
+                snake = self.snake2
+            
+            if alive and not was_alive:
+                self._hash ^= self._dead_keys[player]
+            if move is None:
+                continue
+            new_head, tail, food_index = move
+            # 先补回尾部，长度为1的蛇才能取到旧头部
+            if tail is not None:
+                snake.append(tail)
+                self._set_cell(tail, 2 * player)
+                self._hash ^= self._body_key(player, tail, snake[-2])
+            snake.popleft()
+            self._set_cell(new_head, 0)
+            self._set_cell(snake[0], 2 * player - 1)
+            self._hash ^= (self._cell_key(player - 1, new_head) ^
+                           self._cell_key(player - 1, snake[0]) ^
+                           self._body_key(player, snake[0], new_head))
+            if food_index is not None:
+                self.foods.insert(food_index, new_head)
+                self._set_cell(new_head, self.FOOD_CELL)
+                self._hash ^= self._cell_key(self._FOOD_SLOT, new_head)
+    
+    @property
+    def hash(self) -> int:
+        """局面的64位Zobrist哈希，覆盖蛇头、蛇身（含顺序）、方向、食物、存活状态和轮到哪方走"""
+        return self._hash ^ self._side_key if self.current_player == 2 else self._hash
+    
     def get_valid_actions(self, player: int = None) -> List[Tuple[int, int]]:
-        """获取有效动作列表"""
+        """
+        获取有效动作列表
+        
+        轮流模式下为player（默认当前玩家）的方向；同时模式下不指定player时为两名玩家
+        方向的全部组合 ((dx1, dy1), (dx2, dy2))，指定player时为该玩家自己的方向
+        """
+        if self.simultaneous and player is None:
+            return [(action1, action2) for action1 in self.get_valid_actions(1)
+                    for action2 in self.get_valid_actions(2)]
+        
         # 四个方向：上、下、左、右
         directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
         
@@ -131,6 +225,37 @@ class SnakeGame(BaseGame):
         
         return valid_directions
     
+    def is_legal(self, action) -> bool:
+        """O(1)检查动作是否合法：四个方向之一且不是掉头（同时模式下两个方向都须合法）"""
+        if self.simultaneous:
+            try:
+                action1, action2 = action
+            except (TypeError, ValueError):
+                return False
+            return self._is_legal_direction(1, action1) and self._is_legal_direction(2, action2)
+        return self._is_legal_direction(self.current_player, action)
+    
+    def _is_legal_direction(self, player: int, action: Tuple[int, int]) -> bool:
+        """方向是否为四个方向之一且不是掉头"""
+        direction = self.direction1 if player == 1 else self.direction2
+        return action in self.get_action_space() and action != (-direction[0], -direction[1])
+    
+    def is_occupied(self, pos: Tuple[int, int], ignore_tails: bool = False) -> bool:
+        """
+        O(1)检查界内格子是否被蛇身占据
+        
+        Args:
+            pos: 格子坐标（调用方负责边界检查）
+            ignore_tails: 为True时把两条蛇的蛇尾视为空格（下一步蛇尾会移走）
+        """
+        value = self.board[pos]
+        if value == 0 or value == self.FOOD_CELL:
+            return False
+        if ignore_tails:
+            snake = self.snake1 if value <= 2 else self.snake2
+            return pos != snake[-1]
+        return True
+    
     def is_terminal(self) -> bool:
         """检查游戏是否结束"""
         return not (self.alive1 or self.alive2)
@@ -147,30 +272,17 @@ class SnakeGame(BaseGame):
         else:
             return None  # 平局
     
-    def get_state(self) -> Dict[str, Any]:
-        """获取当前游戏状态"""
-        # 创建棋盘
-        board = np.zeros((self.board_size, self.board_size), dtype=int)
-        
-        # 绘制蛇1
-        for i, (x, y) in enumerate(self.snake1):
-            if 0 <= x < self.board_size and 0 <= y < self.board_size:
-                board[x, y] = 1 if i == 0 else 2  # 头部为1，身体为2
-        
-        # 绘制蛇2
-        for i, (x, y) in enumerate(self.snake2):
-            if 0 <= x < self.board_size and 0 <= y < self.board_size:
-                board[x, y] = 3 if i == 0 else 4  # 头部为3，身体为4
-        
-        # 绘制食物
-        for x, y in self.foods:
-            if 0 <= x < self.board_size and 0 <= y < self.board_size:
-                board[x, y] = 5
+    def get_state(self, copy_board: bool = False) -> Dict[str, Any]:
+        """
+        获取当前游戏状态
         
+        Args:
+            copy_board: 为True时返回棋盘副本，否则返回只读视图（随游戏继续而变化）
+        """
         return {
-            'board': board,
-            'snake1': self.snake1.copy(),
-            'snake2': self.snake2.copy(),
+            'board': self.get_board(copy_board),
+            'snake1': list(self.snake1),
+            'snake2': list(self.snake2),
             'foods': self.foods.copy(),
             'direction1': self.direction1,
             'direction2': self.direction2,
@@ -182,27 +294,68 @@ class SnakeGame(BaseGame):
             'move_count': self.move_count
         }
     
+    def get_board(self, copy: bool = False) -> np.ndarray:
+        """获取棋盘：默认为O(1)的只读视图，copy为True时返回可写副本"""
+        if copy:
+            return self.board.copy()
+        view = self.board.view()
+        view.flags.writeable = False
+        return view
+    
     def render(self) -> np.ndarray:
         """渲染游戏画面"""
-        state = self.get_state()
-        return state['board']
+        return self.get_board()
     
     def clone(self) -> 'SnakeGame':
-        """克隆游戏状态"""
-        cloned_game = SnakeGame(self.board_size, self.initial_length, self.food_count)
+        """克隆游戏状态：只复制蛇身、食物和棋盘等可变状态，配置和键表与原对象共享"""
+        cloned_game = self._shallow_clone()
         cloned_game.snake1 = self.snake1.copy()
         cloned_game.snake2 = self.snake2.copy()
-        cloned_game.direction1 = self.direction1
-        cloned_game.direction2 = self.direction2
         cloned_game.foods = self.foods.copy()
-        cloned_game.alive1 = self.alive1
-        cloned_game.alive2 = self.alive2
-        cloned_game.current_player = self.current_player
-        cloned_game.game_state = self.game_state
-        cloned_game.move_count = self.move_count
+        cloned_game.board = self.board.copy()
+        cloned_game._free = self._free.copy()
         cloned_game.history = self.history.copy()
         return cloned_game
     
+    def get_leaf_state(self) -> Tuple[np.ndarray, np.ndarray]:
+        """局面快照：(各格子的释放时间, 双方蛇头，死亡的蛇为-1)"""
+        from games.snake.territory import release_times
+        heads = np.full((2, 2), -1, dtype=np.int64)
+        for i, (snake, alive) in enumerate(((self.snake1, self.alive1), (self.snake2, self.alive2))):
+            if alive and snake:
+                heads[i] = snake[0]
+        return release_times(self), heads
+    
+    def evaluate_leaf_states(self, states: List[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """按领地之差一次求出整批局面双方的预期得分，领地差一条边长约相当于胜率0.73"""
+        from games.snake.territory import territory_values
+        times = np.stack([times for times, _ in states])
+        heads = np.stack([heads for _, heads in states])
+        value = territory_values(times, heads, self.board_size)
+        return np.stack([np.zeros_like(value), value, 1 - value], axis=1)
+    
+    def get_action_priors(self, actions) -> np.ndarray:
+        """
+        当前玩家各方向的先验分数：撞墙或撞蛇身（含蛇尾，碰撞按移动前的棋盘判定）的方向几乎为0，
+        其余方向离最近食物越近分数越高
+
+        同时模式的联合动作不区分，沿用默认的均匀分数
+        """
+        if self.simultaneous:
+            return super().get_action_priors(actions)
+        head = (self.snake1 if self.current_player == 1 else self.snake2)[0]
+        priors = np.empty(len(actions))
+        for i, (dr, dc) in enumerate(actions):
+            target = (head[0] + dr, head[1] + dc)
+            if not (0 <= target[0] < self.board_size and 0 <= target[1] < self.board_size) or \
+                    self.is_occupied(target):
+                priors[i] = 0.01
+                continue
+            distance = min((abs(target[0] - food[0]) + abs(target[1] - food[1]) for food in self.foods),
+                           default=self.board_size)
+            priors[i] = 1 + 1 / (1 + distance)
+        return priors
+    
     def get_action_space(self):
         """获取动作空间"""
         return [(-1, 0), (1, 0), (0, -1), (0, 1)]
@@ -216,70 +369,147 @@ class SnakeGame(BaseGame):
             'foods': []
         }
     
-    def _move_snake(self, player: int):
-        """移动蛇"""
-        if player == 1:
-            snake = self.snake1
-            direction = self.direction1
-            alive = self.alive1
-        else:
-            snake = self.snake2
-            direction = self.direction2
-            alive = self.alive2
+    def _tick(self, actions) -> Tuple[list, int]:
+        """
+        更新方向并同时移动给出的蛇
         
-        if not alive:
-            return
+        先根据移动前的棋盘判定死亡（出界、撞到任一蛇身含蛇尾、两蛇头进入同一格），
+        再移动存活的蛇，最后补充食物，因此结果与蛇的处理顺序无关
         
-        # 计算新头部位置
-        head = snake[0]
-        new_head = (head[0] + direction[0], head[1] + direction[1])
-        
-        # 检查边界碰撞
-        if (new_head[0] < 0 or new_head[0] >= self.board_size or
-            new_head[1] < 0 or new_head[1] >= self.board_size):
-            if player == 1:
-                self.alive1 = False
-            else:
-                self.alive2 = False
-            return
-        
-        # 检查自身碰撞
-        if new_head in snake:
+        Args:
+            actions: ((玩家, 方向), ...)
+            
+        Returns:
+            撤销记录 ([(玩家, 旧方向, 旧存活状态, 移动记录), ...], 新生成的食物数)
+        """
+        records = []
+        targets = {}
+        for player, action in actions:
             if player == 1:
-                self.alive1 = False
+                direction, alive = self.direction1, self.alive1
+                self.direction1 = action
+                head = self.snake1[0]
             else:
-                self.alive2 = False
-            return
+                direction, alive = self.direction2, self.alive2
+                self.direction2 = action
+                head = self.snake2[0]
+            self._hash ^= self._direction_key(player, direction) ^ self._direction_key(player, action)
+            records.append([player, direction, alive, None])
+            if alive:
+                targets[player] = (head[0] + action[0], head[1] + action[1])
+        
+        dead = {player for player, target in targets.items() if self._is_blocked(target)}
+        if len(targets) == 2 and targets[1] == targets[2]:
+            dead.update(targets)  # 头对头：两条蛇都死亡
+        
+        ate = False
+        for record in records:
+            player = record[0]
+            if player in dead:
+                if player == 1:
+                    self.alive1 = False
+                else:
+                    self.alive2 = False
+                self._hash ^= self._dead_keys[player]
+            elif player in targets:
+                record[3] = self._move_snake(player, targets[player])
+                ate = ate or record[3][1] is None
+        
+        spawned = 0
+        if ate:
+            food_count = len(self.foods)
+            self._generate_foods()
+            spawned = len(self.foods) - food_count
+        return records, spawned
+    
+    def _is_blocked(self, pos: Tuple[int, int]) -> bool:
+        """新头部是否出界或撞到任一条蛇（含蛇尾）"""
+        return (pos[0] < 0 or pos[0] >= self.board_size or
+                pos[1] < 0 or pos[1] >= self.board_size or
+                0 < self.board[pos] < self.FOOD_CELL)
+    
+    def _move_snake(self, player: int, new_head: Tuple[int, int]):
+        """
+        把蛇头移到new_head（调用方已确认不会碰撞），吃到食物时蛇身变长
         
-        # 检查与对方蛇的碰撞
-        other_snake = self.snake2 if player == 1 else self.snake1
-        if new_head in other_snake:
-            if player == 1:
-                self.alive1 = False
-            else:
-                self.alive2 = False
-            return
+        Returns:
+            撤销所需的移动记录 (新头部, 移除的尾部, 被吃食物的下标)
+        """
+        snake = self.snake1 if player == 1 else self.snake2
+        head = snake[0]
         
-        # 移动蛇
-        snake.insert(0, new_head)
+        # 移动蛇：只改写新头部和旧头部两个格子
+        ate = self.board[new_head] == self.FOOD_CELL
+        snake.appendleft(new_head)
+        self._set_cell(new_head, 2 * player - 1)
+        self._set_cell(head, 2 * player)
+        self._hash ^= (self._cell_key(player - 1, new_head) ^
+                       self._cell_key(player - 1, head) ^
+                       self._body_key(player, head, new_head))
         
         # 检查是否吃到食物
-        if new_head in self.foods:
-            self.foods.remove(new_head)
-            self._generate_foods()
-        else:
-            snake.pop()
+        if ate:
+            food_index = self.foods.index(new_head)
+            del self.foods[food_index]
+            self._hash ^= self._cell_key(self._FOOD_SLOT, new_head)
+            return new_head, None, food_index
+        
+        tail = snake.pop()
+        self._set_cell(tail, 0)
+        self._hash ^= self._body_key(player, tail, snake[-1])
+        return new_head, tail, None
     
     def _generate_foods(self):
-        """生成食物"""
-        while len(self.foods) < self.food_count:
-            x = random.randint(0, self.board_size - 1)
-            y = random.randint(0, self.board_size - 1)
-            pos = (x, y)
-            
-            # 确保食物不在蛇身上
-            if pos not in self.snake1 and pos not in self.snake2 and pos not in self.foods:
-                self.foods.append(pos)
+        """在空闲格中均匀随机生成食物，棋盘没有空闲格时停止"""
+        while len(self.foods) < self.food_count and len(self._free) > 0:
+            pos = self._free.sample()
+            self.foods.append(pos)
+            self._set_cell(pos, self.FOOD_CELL)
+            self._hash ^= self._cell_key(self._FOOD_SLOT, pos)
+    
+    def _set_cell(self, pos: Tuple[int, int], value: int):
+        """写入棋盘格子并同步空闲格索引"""
+        if self.board[pos] == 0:
+            if value != 0:
+                self._free.remove(pos)
+        elif value == 0:
+            self._free.add(pos)
+        self.board[pos] = value
+    
+    def _cell_key(self, slot: int, pos: Tuple[int, int]) -> int:
+        """
+        格子的Zobrist键
+        
+        Args:
+            slot: 分区，玩家p的蛇头为p-1，蛇身见_body_key，食物为_FOOD_SLOT
+            pos: 格子坐标
+        """
+        return self._cell_keys[(slot * self.board_size + pos[0]) * self.board_size + pos[1]]
+    
+    def _body_key(self, player: int, pos: Tuple[int, int], prev: Tuple[int, int]) -> int:
+        """蛇身格子的Zobrist键，按它前一节（靠近蛇头的相邻格prev）所在的方向区分"""
+        link = self._DIRECTION_INDEX[(prev[0] - pos[0], prev[1] - pos[1])]
+        return self._cell_key(2 + 4 * (player - 1) + link, pos)
+    
+    def _direction_key(self, player: int, direction: Tuple[int, int]) -> int:
+        """蛇当前方向的Zobrist键"""
+        return self._direction_keys[player][self._DIRECTION_INDEX[direction]]
+    
+    def _compute_hash(self) -> int:
+        """从头计算局面哈希（不含轮到哪方走）"""
+        h = 0
+        for player, snake, alive, direction in ((1, self.snake1, self.alive1, self.direction1),
+                                                (2, self.snake2, self.alive2, self.direction2)):
+            prev = None
+            for pos in snake:
+                h ^= self._cell_key(player - 1, pos) if prev is None else self._body_key(player, pos, prev)
+                prev = pos
+            h ^= self._direction_key(player, direction)
+            if not alive:
+                h ^= self._dead_keys[player]
+        for pos in self.foods:
+            h ^= self._cell_key(self._FOOD_SLOT, pos)
+        return h
     
     def _check_game_over(self) -> bool:
         """检查游戏是否结束"""
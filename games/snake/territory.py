@@ -0,0 +1,168 @@
+"""
+贪吃蛇领地评估
+用numpy整盘膨胀代替逐格广度优先搜索：每一轮把各条蛇已到达的区域向四邻扩展一格，
+蛇身格子要等到蛇尾移走（tick数达到释放时间）后才能进入。
+竞争模式下多条蛇同时扩展，先到达的一方占有该格（Voronoi划分），同时到达的格子不属于任何一方
+"""
+
+from typing import Sequence, Tuple
+import numpy as np
+
+# 永不释放的格子（死亡的蛇身）
+NEVER = np.iinfo(np.int32).max
+
+
+def release_times(game) -> np.ndarray:
+    """
+    各格子可以进入的最早tick (S, S)
+
+    空格和食物为0；长度为L的存活蛇，从蛇头数第i节在L-i个tick后移走，由于碰撞按移动前的棋盘判定，
+    要到第L-i+1个tick才能进入（蛇尾同样挡住下一步）；死亡的蛇身永不移走
+    """
+    times = np.zeros((game.board_size, game.board_size), dtype=np.int32)
+    for snake, alive in ((game.snake1, game.alive1), (game.snake2, game.alive2)):
+        length = len(snake)
+        for i, pos in enumerate(snake):
+            times[pos] = length - i + 1 if alive else NEVER
+    return times
+
+
+def flood_fill(times: np.ndarray, starts: np.ndarray, start_ticks: np.ndarray,
+               competitive: bool = True) -> np.ndarray:
+    """
+    批量洪水填充
+
+    Args:
+        times: (B, S, S) 各格子的释放时间
+        starts: (B, P, 2) 每条蛇的起点，行为负数表示该蛇不参与
+        start_ticks: (B, P) 每条蛇位于起点的tick
+        competitive: True时各蛇互相争夺格子（Voronoi），False时各自独立填充
+
+    Returns:
+        (B, P, S, S) 每条蛇到达各格子的tick，未到达为-1
+    """
+    batch, players = start_ticks.shape
+    size = times.shape[-1]
+    # 四周补一圈永不释放的格子，膨胀时无需判断边界
+    padded = np.full((batch, size + 2, size + 2), NEVER, dtype=np.int32)
+    padded[:, 1:-1, 1:-1] = times
+    region = np.zeros((batch, players, size + 2, size + 2), dtype=bool)
+    arrival = np.full((batch, players, size, size), -1, dtype=np.int32)
+    claimed = np.zeros((batch, size, size), dtype=bool)
+
+    b, p = np.nonzero(starts[..., 0] >= 0)
+    rows, cols = starts[b, p, 0], starts[b, p, 1]
+    region[b, p, rows + 1, cols + 1] = True
+    arrival[b, p, rows, cols] = start_ticks[b, p]
+    claimed[b, rows, cols] = True
+
+    inner = region[..., 1:-1, 1:-1]
+    times = padded[:, None, 1:-1, 1:-1]
+    tick = 1
+    while True:
+        grown = (region[..., :-2, 1:-1] | region[..., 2:, 1:-1] |
+                 region[..., 1:-1, :-2] | region[..., 1:-1, 2:])
+        candidates = grown & ~inner & (start_ticks < tick)[..., None, None]
+        if competitive:
+            candidates &= ~claimed[:, None]
+        ready = candidates & (times <= tick)
+        if competitive:
+            # 同一tick被多条蛇到达的格子不归任何一方，但之后也不能再进入
+            reached = ready.sum(axis=1)
+            ready &= (reached == 1)[:, None]
+            claimed |= reached > 0
+        if ready.any():
+            inner |= ready
+            arrival[ready] = tick
+            tick += 1
+            continue
+
+        # 本轮无法扩展：跳到下一个相邻蛇身格子释放或下一条蛇开始扩展的tick
+        pending = start_ticks[start_ticks >= tick]
+        events = [int(pending.min()) + 1] if pending.size else []
+        waiting = candidates & (times > tick) & (times < NEVER)
+        if waiting.any():
+            events.append(int(np.broadcast_to(times, waiting.shape)[waiting].min()))
+        if not events:
+            return arrival
+        tick = max(tick + 1, min(events))
+
+
+def evaluate_actions(game, player: int, actions: Sequence[Tuple[int, int]]) -> dict:
+    """
+    一次调用评估玩家所有候选动作的后继局面
+
+    后继局面中该玩家的蛇头在tick 1位于新位置，对手仍从当前蛇头出发；
+    吃到食物时蛇身晚一个tick释放。撞墙或撞到任一蛇身（含蛇尾）的动作可达面积和领地均为0
+
+    Args:
+        game: SnakeGame
+        player: 玩家
+        actions: 候选方向 [(dx, dy), ...]
+
+    Returns:
+        'reachable': (K,) 只考虑自己时可到达的格子数（不含蛇头所在格）
+        'territory': (K,) 双方同时扩展时先到达的格子数
+        'opponent_territory': (K,) 对手先到达的格子数
+    """
+    size = game.board_size
+    snake, opponent = (game.snake1, game.snake2) if player == 1 else (game.snake2, game.snake1)
+    opponent_alive = game.alive2 if player == 1 else game.alive1
+    base = release_times(game)
+    own = np.zeros_like(base, dtype=bool)
+    for pos in snake:
+        own[pos] = True
+
+    count = len(actions)
+    times = np.repeat(base[None], count, axis=0)
+    starts = np.full((count, 2, 2), -1, dtype=np.int64)
+    start_ticks = np.zeros((count, 2), dtype=np.int64)
+    legal = np.zeros(count, dtype=bool)
+    head = snake[0]
+    for k, (dx, dy) in enumerate(actions):
+        new_head = (head[0] + dx, head[1] + dy)
+        if not (0 <= new_head[0] < size and 0 <= new_head[1] < size) or base[new_head] > 0:
+            continue
+        legal[k] = True
+        grown = int(game.board[new_head] == game.FOOD_CELL)
+        times[k][own] += grown
+        # 新蛇头在tick 1时为第0节，蛇长L（吃到食物为L+1）时要到tick 1+L+1才能进入
+        times[k][new_head] = len(snake) + grown + 2
+        starts[k, 0] = new_head
+        start_ticks[k, 0] = 1
+        if opponent_alive and opponent:
+            starts[k, 1] = opponent[0]
+
+    result = {'reachable': np.zeros(count, dtype=np.int64),
+              'territory': np.zeros(count, dtype=np.int64),
+              'opponent_territory': np.zeros(count, dtype=np.int64)}
+    if not legal.any():
+        return result
+    # 去掉对手后的竞争填充即为独立填充，两组后继局面拼成一批只调用一次
+    times, starts, start_ticks = times[legal], starts[legal], start_ticks[legal]
+    solo_starts = starts.copy()
+    solo_starts[:, 1] = -1
+    arrival = flood_fill(np.concatenate([times, times]), np.concatenate([starts, solo_starts]),
+                         np.concatenate([start_ticks, start_ticks]))
+    shared, solo = arrival[:len(times)], arrival[len(times):]
+    result['reachable'][legal] = (solo[:, 0] > 1).sum(axis=(1, 2))
+    result['territory'][legal] = (shared[:, 0] > 1).sum(axis=(1, 2))
+    result['opponent_territory'][legal] = (shared[:, 1] > 0).sum(axis=(1, 2))
+    return result
+
+
+def territory_values(times: np.ndarray, starts: np.ndarray, scale: float) -> np.ndarray:
+    """
+    按双方同时扩展时的领地之差批量估计玩家1的胜率
+
+    Args:
+        times: (B, S, S) 各局面的释放时间（见 release_times）
+        starts: (B, 2, 2) 双方蛇头，死亡的蛇行为-1（没有领地）
+        scale: 领地差除以scale后经logistic函数换算为胜率
+
+    Returns:
+        (B,) 玩家1的胜率估计
+    """
+    arrival = flood_fill(times, starts, np.zeros(starts.shape[:2], dtype=np.int64))
+    territory = (arrival >= 0).sum(axis=(2, 3))
+    return 1.0 / (1.0 + np.exp((territory[:, 1] - territory[:, 0]) / scale))
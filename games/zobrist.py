@@ -0,0 +1,27 @@
+"""
+Zobrist哈希随机键
+同一个种子在任何进程中都生成相同的键，便于跨进程共享置换表和开局库
+"""
+
+import random
+from functools import lru_cache
+from typing import Tuple
+
+# 默认种子，所有游戏共用
+DEFAULT_SEED = 20250622
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(count: int, seed: int = DEFAULT_SEED) -> Tuple[int, ...]:
+    """
+    生成count个64位随机键
+
+    Args:
+        count: 键的数量
+        seed: 随机种子
+
+    Returns:
+        由Python整数组成的元组，相同参数返回同一个缓存对象
+    """
+    rng = random.Random(seed)
+    return tuple(rng.getrandbits(64) for _ in range(count))
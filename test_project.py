@@ -77,6 +77,320 @@ def test_gomoku_game():
         return False
 
 
+def test_gomoku_winner():
+    """测试五子棋增量胜负判定"""
+    print("\n=== 测试五子棋胜负判定 ===")
+    
+    try:
+        from games.gomoku import GomokuGame
+        
+        game = GomokuGame(board_size=9, win_length=5)
+        # 玩家1沿副对角线落子，玩家2在第0行落子
+        moves = [(4, 4), (0, 0), (3, 5), (0, 1), (2, 6), (0, 2), (1, 7), (0, 3)]
+        for action in moves:
+            game.step(action)
+            assert game.get_winner() is None and not game.is_terminal()
+        
+        observation, reward, done, info = game.step((5, 3))
+        assert done and reward == 1
+        assert game.get_winner() == 1 and game.is_terminal()
+        print("✓ 最后一步胜负判定正确")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 五子棋胜负判定测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_gomoku_bitboard():
+    """测试五子棋位棋盘后端"""
+    print("\n=== 测试五子棋位棋盘后端 ===")
+    
+    try:
+        import random
+        from games.gomoku import GomokuGame, BitboardGomokuGame
+        
+        rng = random.Random(0)
+        for _ in range(20):
+            game = GomokuGame(board_size=9, win_length=5)
+            bitboard_game = BitboardGomokuGame(board_size=9, win_length=5)
+            actions = game.get_valid_actions()
+            rng.shuffle(actions)
+            for action in actions:
+                _, reward, done, _ = game.step(action)
+                _, bit_reward, bit_done, _ = bitboard_game.step(action)
+                assert (reward, done) == (bit_reward, bit_done)
+                assert (game.board == bitboard_game.board).all()
+                if done:
+                    break
+            assert game.get_winner() == bitboard_game.get_winner()
+        print("✓ 位棋盘与numpy棋盘结果一致")
+        
+        # 整体赋值棋盘即加载局面，两种后端都重建空格索引、候选点、哈希和胜负
+        played = GomokuGame(board_size=9, win_length=5)
+        for action in [(4, 4), (4, 0), (4, 5), (3, 3)]:
+            played.apply(action)
+        for game_class in (GomokuGame, BitboardGomokuGame):
+            game = game_class(board_size=9, win_length=5)
+            game.board = played.board.copy()
+            assert (game.board == played.board).all()
+            assert not game.is_legal((4, 0)) and game.is_legal((0, 0))
+            assert len(game.get_valid_actions()) == 77
+            assert set(game.get_candidate_actions()) == set(played.get_candidate_actions())
+            assert game.hash == played.hash and game.current_player == 1
+            _, reward, done, info = game.step((4, 0))
+            assert done and 'error' in info and game.board[4, 0] == 2
+            winning = played.board.copy()
+            winning[0, :5] = 1
+            game.board = winning
+            assert game.get_winner() == 1 and game.is_terminal()
+        print("✓ 加载局面后派生状态与逐步落子一致")
+        
+        # 棋盘只读，原地改写会与派生状态脱节
+        for game_class in (GomokuGame, BitboardGomokuGame):
+            game = game_class(board_size=9, win_length=5)
+            game.step((4, 4))
+            board = game.board
+            assert not board.flags.writeable and board[4, 4] == 1
+            try:
+                board[0, 0] = 1
+                assert False, "棋盘应为只读"
+            except ValueError:
+                pass
+            assert game.is_legal((0, 0)) and game.get_state()['board'].flags.writeable
+        print("✓ 棋盘为只读视图")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 五子棋位棋盘测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_apply_undo():
+    """测试apply/undo可逆走子"""
+    print("\n=== 测试apply/undo ===")
+    
+    try:
+        import random
+        from games.gomoku import GomokuGame
+        from games.snake import SnakeGame
+        
+        game = GomokuGame(board_size=9, win_length=5)
+        board = game.board.copy()
+        actions = game.get_valid_actions()[:10]
+        for action in actions:
+            game.apply(action)
+        for _ in actions:
+            game.undo()
+        assert (game.board == board).all()
+        assert game.current_player == 1 and game.move_count == 0 and not game.history
+        print("✓ 五子棋apply/undo可逆")
+        
+        random.seed(0)
+        snake_game = SnakeGame(board_size=8)
+        before = (list(snake_game.snake1), list(snake_game.snake2), list(snake_game.foods))
+        moves = 0
+        while snake_game.alive1 and moves < 30:
+            snake_game.apply(random.choice(snake_game.get_valid_actions()))
+            moves += 1
+        for _ in range(moves):
+            snake_game.undo()
+        assert (list(snake_game.snake1), list(snake_game.snake2), list(snake_game.foods)) == before
+        assert snake_game.alive1 and snake_game.direction1 == (0, 1)
+        print("✓ 贪吃蛇apply/undo可逆")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ apply/undo测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_gomoku_candidates():
+    """测试五子棋候选点增量维护"""
+    print("\n=== 测试五子棋候选点 ===")
+    
+    try:
+        import random
+        from games.gomoku import GomokuGame
+        
+        def brute_force(game):
+            size, distance = game.board_size, game.candidate_distance
+            stones = [(r, c) for r in range(size) for c in range(size) if game.board[r, c] != 0]
+            if not stones:
+                return {(size // 2, size // 2)}
+            near = {(r, c) for r in range(size) for c in range(size)
+                    if game.board[r, c] == 0 and
+                    any(max(abs(r - sr), abs(c - sc)) <= distance for sr, sc in stones)}
+            return near or set(game.get_valid_actions())
+        
+        rng = random.Random(0)
+        for distance in (1, 2, 3):
+            game = GomokuGame(board_size=9, win_length=5, candidate_distance=distance)
+            assert set(game.get_candidate_actions()) == brute_force(game)
+            for _ in range(200):
+                if game.move_count and (game.is_terminal() or rng.random() < 0.4):
+                    game.undo()
+                else:
+                    game.apply(rng.choice(game.get_valid_actions()))
+                assert set(game.get_candidate_actions()) == brute_force(game)
+        print("✓ apply/undo交替后候选点与逐格扫描一致（距离1~3）")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 五子棋候选点测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_clone():
+    """测试游戏克隆"""
+    print("\n=== 测试游戏克隆 ===")
+    
+    try:
+        from games.gomoku import GomokuGame, BitboardGomokuGame
+        from games.snake import SnakeGame
+        
+        for game_class in (GomokuGame, BitboardGomokuGame):
+            game = game_class(board_size=9, win_length=5)
+            game.step((4, 4))
+            cloned = game.clone()
+            assert (cloned.board == game.board).all() and cloned.hash == game.hash
+            cloned.step((4, 5))
+            assert game.board[4, 5] == 0 and game.move_count == 1 and len(game.history) == 1
+            assert game.is_legal((4, 5)) and not cloned.is_legal((4, 5))
+        print("✓ 五子棋克隆与原对象互不影响")
+        
+        game = SnakeGame(board_size=10)
+        cloned = game.clone()
+        cloned.step((1, 0))
+        assert list(game.snake1) != list(cloned.snake1)
+        assert game.board[cloned.snake1[0]] != 1 and cloned.board[cloned.snake1[0]] == 1
+        assert cloned.clone().hash == cloned.hash
+        print("✓ 贪吃蛇克隆与原对象互不影响")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 游戏克隆测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_zobrist_hash():
+    """测试Zobrist哈希"""
+    print("\n=== 测试Zobrist哈希 ===")
+    
+    try:
+        from games.gomoku import GomokuGame
+        
+        game1 = GomokuGame(board_size=9, win_length=5)
+        game2 = GomokuGame(board_size=9, win_length=5)
+        empty_hash = game1.hash
+        for action in [(1, 1), (2, 2), (3, 3), (4, 4)]:
+            game1.step(action)
+        for action in [(3, 3), (4, 4), (1, 1), (2, 2)]:
+            game2.step(action)
+        assert game1.hash == game2.hash != empty_hash
+        print("✓ 不同走子顺序到达的相同局面哈希一致")
+        
+        game1.step((5, 5))
+        assert game1.hash != game2.hash
+        game1.undo()
+        assert game1.hash == game2.hash
+        assert game1.clone().hash == game1.hash
+        print("✓ 走子和撤销时哈希增量更新正确")
+        
+        import random
+        from collections import deque
+        from games.snake import SnakeGame
+        random.seed(0)
+        snake_game = SnakeGame(board_size=8)
+        hashes = [snake_game.hash]
+        while not snake_game.is_terminal() and len(hashes) < 40:
+            snake_game.current_player = random.choice([1, 2])
+            snake_game.apply(random.choice(snake_game.get_valid_actions()))
+            assert snake_game._hash == snake_game._compute_hash()
+            hashes.append(snake_game.hash)
+        snake_game.current_player = 1
+        for _ in range(len(hashes) - 1):
+            snake_game.undo()
+            assert snake_game._hash == snake_game._compute_hash()
+        assert snake_game.hash == hashes[0]
+        print("✓ 贪吃蛇哈希增量更新与从头计算一致")
+        
+        # 蛇身格子相同但顺序不同、或只有方向不同的局面哈希不同
+        def place(game, body, direction):
+            for pos in game.snake1:
+                game._set_cell(pos, 0)
+            game.snake1 = deque(body)
+            for i, pos in enumerate(body):
+                game._set_cell(pos, 1 if i == 0 else 2)
+            game.direction1 = direction
+            game._hash = game._compute_hash()
+            return game.hash
+        snake_game = SnakeGame(board_size=8, food_count=0)
+        assert (place(snake_game, [(0, 1), (1, 1), (1, 0), (0, 0)], (-1, 0)) !=
+                place(snake_game, [(0, 1), (0, 0), (1, 0), (1, 1)], (-1, 0)))
+        assert place(snake_game, [(3, 3)], (0, 1)) != place(snake_game, [(3, 3)], (1, 0))
+        print("✓ 贪吃蛇哈希区分蛇身顺序和方向")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ Zobrist哈希测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_batch_gomoku():
+    """测试批量五子棋模拟器"""
+    print("\n=== 测试批量五子棋模拟器 ===")
+    
+    try:
+        from games.gomoku import GomokuGame, BatchGomokuGame
+        
+        batch = BatchGomokuGame(num_games=50, board_size=9, win_length=5, seed=0)
+        games = [GomokuGame(board_size=9, win_length=5) for _ in range(50)]
+        while not batch.done.all():
+            actions = batch.random_actions()
+            _, rewards, dones, info = batch.step(actions)
+            for i, game in enumerate(games):
+                if game.is_terminal():
+                    continue
+                _, reward, done, _ = game.step(divmod(int(actions[i]), 9))
+                assert (reward, done) == (rewards[i], dones[i])
+            assert not info['legal_mask'][dones].any()
+        assert [game.get_winner() or 0 for game in games] == batch.winner.tolist()
+        print("✓ 批量模拟结果与逐盘模拟一致")
+        
+        # 只剩一个空格，先手落下即成三连
+        game = GomokuGame(board_size=3, win_length=3)
+        for move in [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (2, 1), (2, 0)]:
+            game.apply(move)
+        assert game.random_playouts(20, seed=0).tolist() == [1] * 20
+        game.apply((2, 2))
+        assert game.random_playouts(5, seed=0).tolist() == [1] * 5
+        
+        game = GomokuGame(board_size=9, win_length=5)
+        winners = game.random_playouts(200, seed=0)
+        assert set(winners.tolist()) <= {0, 1, 2} and game.move_count == 0
+        print("✓ 一次求出批量随机对弈的结果")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 批量五子棋模拟器测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
 def test_gomoku_env():
     """测试五子棋环境"""
     print("\n=== 测试五子棋环境 ===")
@@ -101,6 +415,17 @@ def test_gomoku_env():
         observation, reward, terminated, truncated, info = env.step(action)
         print("✓ 环境动作执行成功")
         
+        # 测试非法动作：已有棋子、越界、不是坐标元组
+        game = env.game
+        assert game.is_legal((8, 8)) and not game.is_legal(action)
+        for bad_action in [action, (9, 0), (-1, 3), (0, 9), 7, None, 'a1', (1, 2, 3)]:
+            assert not game.is_legal(bad_action)
+            moves = game.move_count
+            observation, reward, terminated, truncated, info = env.step(bad_action)
+            assert terminated and reward == -1000 and info['error'] == 'Invalid action'
+            assert game.move_count == moves
+        print("✓ 非法动作被拒绝且不改变局面")
+        
         # 测试渲染
         env.render(mode='human')
         print("✓ 环境渲染成功")
@@ -148,6 +473,331 @@ def test_agents():
         return False
 
 
+def test_mcts_tree():
+    """测试MCTS树搜索与子树复用"""
+    print("\n=== 测试MCTS树搜索 ===")
+    
+    try:
+        import numpy as np
+        from agents import MCTSBot
+        from games.gomoku import GomokuEnv
+        
+        env = GomokuEnv(board_size=9, win_length=5)
+        observation, info = env.reset()
+        env.step((4, 4))
+        env.step((4, 5))
+        bot = MCTSBot(name="测试MCTSBot", player_id=1)
+        bot.simulation_count = 300
+        board = env.game.board.copy()
+        action = bot.get_action(observation, env)
+        assert np.array_equal(env.game.board, board)
+        assert bot.last_search['root_visits'] == 300
+        assert env.game.is_legal(action)
+        print("✓ 搜索后局面不变，根节点访问次数等于模拟次数")
+        
+        # 对手按树中访问最多的应手落子，下一步应复用这部分统计
+        game = env.game.clone()
+        game.apply(action)
+        replies = bot.pool.child_visits(bot.pool.find(game.hash))
+        reply = max(replies, key=replies.get)
+        env.step(action)
+        env.step(reply)
+        bot.get_action(observation, env)
+        assert bot.last_search['reused_visits'] > 0
+        assert bot.last_search['root_visits'] == bot.last_search['reused_visits'] + 300
+        print("✓ 对手应手后复用对应子树")
+        
+        # 不同走子顺序到达的同一局面共用一个节点
+        game = env.game.clone()
+        for move in [(0, 0), (0, 1), (0, 2)]:
+            game.apply(move)
+        node = bot.pool.new_node(game.hash, 1)
+        for _ in range(3):
+            game.undo()
+        for move in [(0, 2), (0, 1), (0, 0)]:
+            game.apply(move)
+        assert bot.pool.find(game.hash) == node
+        print("✓ 置换局面共用同一节点")
+        
+        # 节点池容量很小时淘汰访问最少的节点，搜索仍能正常进行
+        from agents.ai_bots.mcts_tree import NodePool
+        bot.pool = NodePool(64)
+        action = bot.get_action(observation, env)
+        assert env.game.is_legal(action)
+        assert len(bot.pool) <= 64 and bot.last_search['evictions'] > 0
+        assert bot.last_search['root_visits'] == 300
+        print("✓ 节点池用满时淘汰节点并压缩")
+        
+        # 按内存上限划分节点和边，压缩后内存仍不超过上限
+        budget = 64 * 1024
+        bot.pool = NodePool.from_budget(budget, 8)
+        assert bot.pool.max_edges == 8 * bot.pool.max_nodes and bot.pool.memory_usage() <= budget
+        bot.simulation_count = 1000
+        action = bot.get_action(observation, env)
+        assert env.game.is_legal(action) and bot.last_search['evictions'] > 0
+        assert bot.pool.collections > 0 and bot.pool.memory_usage() <= budget
+        info = bot.get_info()
+        assert info['tree_memory_bytes'] <= budget and 0 < info['tree_edges'] <= info['max_edges']
+        default_bot = MCTSBot()
+        assert default_bot.get_info()['tree_memory_bytes'] <= default_bot.max_tree_bytes
+        bot.simulation_count = 300
+        print("✓ 节点池内存不超过上限")
+        
+        bot.rollout_batch = 16
+        action = bot.get_action(observation, env)
+        assert env.game.is_legal(action)
+        print("✓ 每个叶节点批量模拟")
+        
+        bot.rollout_batch = 1
+        bot.rave = True
+        action = bot.get_action(observation, env)
+        assert env.game.is_legal(action)
+        root = bot._root
+        first, count = bot.pool.first_child[root], bot.pool.num_children[root]
+        assert bot.pool.rave_visits[first:first + count].sum() > 0
+        print("✓ RAVE在回传时更新AMAF统计")
+        
+        bot.reset()
+        assert bot._root is None and len(bot.pool) == 0
+        print("✓ 重置后清空搜索树")
+        
+        from agents.ai_bots.mcts_bot import shutdown_worker_pool
+        parallel_bot = MCTSBot(name="并行MCTSBot", player_id=1, num_workers=2)
+        parallel_bot.simulation_count = 50
+        action = parallel_bot.get_action(observation, env)
+        assert env.game.is_legal(action)
+        # 两个任务可能由同一进程先后在同一棵树上完成，新增的访问次数仍为2 x 50
+        stats = parallel_bot.last_search
+        assert stats['root_visits'] - stats['reused_visits'] == 100
+        action = parallel_bot.get_action(observation, env)
+        assert parallel_bot.last_search['reused_visits'] > 0
+        shutdown_worker_pool()
+        print("✓ 根并行合并各进程的访问次数")
+        
+        # 任务数多于进程数时同一进程先后执行多个任务，各任务共用一个绝对截止时刻
+        import multiprocessing
+        import agents.ai_bots.mcts_bot as mcts_module
+        mcts_module._worker_pool = multiprocessing.Pool(1)
+        mcts_module._worker_pool_size = 3
+        timed_bot = MCTSBot(name="限时并行MCTSBot", player_id=1, num_workers=3, timeout=0.3)
+        timed_bot.simulation_count = 10 ** 9
+        action = timed_bot.get_action(observation, env)
+        assert env.game.is_legal(action)
+        assert timed_bot.last_search['time'] < 0.3 + 0.2 and timed_bot.last_search['iterations'] > 0
+        shutdown_worker_pool()
+        print("✓ 根并行的各任务在同一截止时刻前结束")
+        
+        # 主进程调整过的搜索参数原样转发给工作进程中的搜索者
+        from agents.ai_bots.mcts_bot import WORKER_SETTINGS, _search_worker, _worker_bots
+        tuned_bot = MCTSBot(name="调参MCTSBot", player_id=1)
+        tuned_bot.simulation_count = 20
+        tuned_bot.rave = True
+        tuned_bot.rave_schedule, tuned_bot.rave_parameter = 'mse', 0.3
+        tuned_bot.progressive_widening = True
+        tuned_bot.widening_constant, tuned_bot.widening_exponent = 3.0, 0.4
+        tuned_bot.leaf_evaluator, tuned_bot.leaf_batch, tuned_bot.virtual_loss = True, 4, 3
+        settings = {name: getattr(tuned_bot, name) for name in WORKER_SETTINGS}
+        settings['deadline'] = None
+        key = ('tuned', 0)
+        _search_worker((key, env.game.clone(), 1, settings, 0))
+        for name in WORKER_SETTINGS:
+            assert getattr(_worker_bots[key], name) == getattr(tuned_bot, name), name
+        del _worker_bots[key]
+        print("✓ 搜索参数全部转发给工作进程")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ MCTS树搜索测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_progressive_widening():
+    """测试渐进展开与各游戏的动作先验"""
+    print("\n=== 测试渐进展开 ===")
+    
+    try:
+        import math
+        import numpy as np
+        from agents import MCTSBot
+        from games.gomoku import GomokuEnv, GomokuGame
+        from games.snake.snake_game import SnakeGame
+        
+        # 黑方水平冲四，白方应先堵(4, 7)
+        game = GomokuGame(board_size=9)
+        for move in [(4, 4), (0, 0), (4, 5), (4, 2), (4, 6), (0, 1), (4, 3)]:
+            game.apply(move)
+        actions = game.get_candidate_actions()
+        priors = game.get_action_priors(actions)
+        ranked = [actions[i] for i in np.argsort(-priors)]
+        assert ranked[0] == (4, 7)
+        print("✓ 五子棋先验：堵四排在最前")
+        
+        snake = SnakeGame(board_size=10)
+        actions = snake.get_valid_actions()
+        priors = snake.get_action_priors(actions)
+        head = snake.snake1[0]
+        for (dr, dc), prior in zip(actions, priors):
+            target = (head[0] + dr, head[1] + dc)
+            unsafe = not (0 <= target[0] < 10 and 0 <= target[1] < 10) or snake.is_occupied(target)
+            assert (prior < 0.1) == unsafe
+        print("✓ 贪吃蛇先验：危险方向接近0")
+        
+        env = GomokuEnv(board_size=9, win_length=5)
+        observation, info = env.reset()
+        for move in [(4, 4), (0, 0), (4, 5), (4, 2), (4, 6), (0, 1), (4, 3)]:
+            env.step(move)
+        bot = MCTSBot(name="渐进展开MCTSBot", player_id=2)
+        bot.simulation_count = 200
+        bot.progressive_widening = True
+        action = bot.get_action(observation, env)
+        assert env.game.is_legal(action)
+        root = bot._root
+        width = math.ceil(bot.widening_constant * 200 ** bot.widening_exponent)
+        assert bot.pool.num_expanded[root] <= width < bot.pool.num_children[root]
+        first = bot.pool.first_child[root]
+        assert bot.pool.actions[bot.pool.edge_action[first]] == (4, 7)
+        print("✓ 子节点按先验排序，展开数随访问次数增长")
+        
+        bot.rave = True
+        action = bot.get_action(observation, env)
+        assert env.game.is_legal(action)
+        print("✓ RAVE与渐进展开同时使用")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 渐进展开测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_leaf_evaluator():
+    """测试批量局面评估器代替随机模拟"""
+    print("\n=== 测试局面评估器 ===")
+    
+    try:
+        import numpy as np
+        from agents import MCTSBot
+        from agents.ai_bots.mcts_tree import NodePool
+        from games.gomoku import GomokuEnv, GomokuGame
+        from games.snake.snake_game import SnakeGame
+        
+        # 黑方冲四且轮到黑方走时必胜
+        moves = [(4, 4), (0, 0), (4, 5), (4, 2), (4, 6), (0, 1), (4, 3), (0, 5)]
+        game = GomokuGame(board_size=9)
+        states = [game.get_leaf_state()]
+        for move in moves:
+            game.apply(move)
+        states.append(game.get_leaf_state())
+        values = game.evaluate_leaf_states(states)
+        assert values.shape == (2, 3) and np.allclose(values[:, 1] + values[:, 2], 1)
+        assert values[0, 1] == 0.5 and values[1, 1] == 1.0
+        
+        snake = SnakeGame(board_size=10)
+        values = snake.evaluate_leaf_states([snake.get_leaf_state()] * 3)
+        assert values.shape == (3, 3) and np.allclose(values[:, 1] + values[:, 2], 1)
+        print("✓ 五子棋棋型评估与贪吃蛇领地评估")
+        
+        # 白方冲四，黑方必须堵(4, 7)
+        env = GomokuEnv(board_size=9, win_length=5)
+        observation, info = env.reset()
+        for move in [(0, 0), (4, 4), (4, 2), (4, 5), (0, 8), (4, 6), (8, 0), (4, 3)]:
+            env.step(move)
+        bot = MCTSBot(name="评估器MCTSBot", player_id=1)
+        bot.simulation_count = 2000
+        bot.leaf_evaluator = True
+        board = env.game.board.copy()
+        action = bot.get_action(observation, env)
+        assert action == (4, 7)
+        assert np.array_equal(env.game.board, board)
+        assert bot.last_search['root_visits'] == 2000
+        assert (bot.pool.visits[:len(bot.pool)] >= 0).all()
+        print("✓ 批量评估后撤去虚拟失败，找到必须堵的点")
+        
+        # 节点池压缩前先回传待评估的叶节点
+        bot.pool = NodePool(64)
+        bot.leaf_batch = 8
+        action = bot.get_action(observation, env)
+        assert bot.last_search['evictions'] > 0 and bot.last_search['root_visits'] == 2000
+        print("✓ 节点池压缩时批次正确回传")
+        
+        snake_bot = MCTSBot(name="评估器MCTSBot", player_id=1)
+        snake_bot.simulation_count = 50
+        snake_bot.leaf_evaluator = True
+        root = snake_bot.search_root(snake.clone())
+        assert set(snake_bot.pool.child_visits(root)) <= set(snake.get_valid_actions())
+        print("✓ 贪吃蛇使用领地评估搜索")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 局面评估器测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_search_timeout():
+    """测试按时间上限停止的搜索"""
+    print("\n=== 测试搜索时间上限 ===")
+    
+    try:
+        import time
+        from agents import MCTSBot, MinimaxBot
+        from games.gomoku import GomokuEnv
+        
+        env = GomokuEnv(board_size=15, win_length=5)
+        observation, info = env.reset()
+        env.step((7, 7))
+        env.step((7, 8))
+        
+        minimax_bot = MinimaxBot(name="限时MinimaxBot", player_id=1, max_depth=6, timeout=0.2)
+        start = time.time()
+        action = minimax_bot.get_action(observation, env)
+        assert time.time() - start < 0.5
+        assert env.game.is_legal(action)
+        search = minimax_bot.get_info()['last_search']
+        assert 1 <= search['depth'] < 6 and search['nodes'] > 0
+        print(f"✓ Minimax迭代加深在时限内完成{search['depth']}层")
+        
+        mcts_bot = MCTSBot(name="限时MCTSBot", player_id=1, timeout=0.2)
+        mcts_bot.simulation_count = 10 ** 9
+        start = time.time()
+        action = mcts_bot.get_action(observation, env)
+        assert time.time() - start < 0.5
+        assert env.game.is_legal(action)
+        search = mcts_bot.get_info()['last_search']
+        assert search['iterations'] > 0 and search['root_visits'] == search['iterations']
+        print(f"✓ MCTS在时限内完成{search['iterations']}次模拟")
+        
+        # 轮流模式的贪吃蛇中一方死亡后模拟不会自然结束，靠模拟内的时限和步数上限停止
+        from games.snake import SnakeEnv
+        snake_env = SnakeEnv(board_size=8)
+        snake_env.reset()
+        mcts_bot = MCTSBot(name="限时MCTSBot", player_id=1, timeout=0.2)
+        mcts_bot.simulation_count = 10 ** 9
+        mcts_bot.max_rollout_depth = None
+        start = time.time()
+        action = mcts_bot.get_action(None, snake_env)
+        assert time.time() - start < 0.5 and snake_env.game.is_legal(action)
+        mcts_bot = MCTSBot(name="限步MCTSBot", player_id=1, timeout=None)
+        mcts_bot.simulation_count = 20
+        mcts_bot.max_rollout_depth = 50
+        assert snake_env.game.is_legal(mcts_bot.get_action(None, snake_env))
+        game = snake_env.game.clone()
+        start_hash = game.hash
+        assert (game.random_playouts(3, seed=0, max_depth=50) == 0).all() and game.hash == start_hash
+        print("✓ 模拟内检查时限和步数上限")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 搜索时间上限测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
 def test_game_play():
     """测试游戏对战"""
     print("\n=== 测试游戏对战 ===")
@@ -250,6 +900,398 @@ def test_custom_agents():
         return False
 
 
+def test_snake_board():
+    """测试贪吃蛇棋盘增量维护"""
+    print("\n=== 测试贪吃蛇棋盘 ===")
+    
+    try:
+        import random
+        import numpy as np
+        from games.snake import SnakeGame, SnakeEnv
+        
+        def rebuild(game):
+            board = np.zeros((game.board_size, game.board_size), dtype=int)
+            for player, snake in ((1, game.snake1), (2, game.snake2)):
+                for i, pos in enumerate(snake):
+                    board[pos] = 2 * player - 1 if i == 0 else 2 * player
+            for pos in game.foods:
+                board[pos] = game.FOOD_CELL
+            return board
+        
+        random.seed(0)
+        game = SnakeGame(board_size=8)
+        for _ in range(50):
+            if game.is_terminal():
+                break
+            game.current_player = random.choice([1, 2])
+            game.step(random.choice(game.get_valid_actions()))
+            assert (game.get_board() == rebuild(game)).all()
+        print("✓ 增量维护的棋盘与重建结果一致")
+        
+        # 食物数超过空闲格时填满空闲格后停止，reset和step都能返回
+        crowded = SnakeGame(board_size=5, food_count=30)
+        assert len(crowded.foods) == 23 and len(crowded._free) == 0
+        crowded.reset()
+        assert len(crowded.foods) == 23
+        _, _, done, info = crowded.step((0, 1))
+        # 吃到食物后蛇身变长，棋盘仍是满的，没有空闲格补充食物
+        assert not done and info['food_count'] == 22 and info['snake1_length'] == 2
+        assert (crowded.get_board() == rebuild(crowded)).all() and (crowded.get_board() != 0).all()
+        print("✓ 食物数超过空闲格时不会死循环")
+        
+        view = game.get_state()['board']
+        assert not view.flags.writeable
+        assert game.get_state(copy_board=True)['board'].flags.writeable
+        env = SnakeEnv(board_size=8)
+        observation, _ = env.reset()
+        assert not observation.flags.writeable and observation.any()
+        print("✓ 观察为只读视图，需要时可取副本")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 贪吃蛇棋盘测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_snake_simultaneous():
+    """测试贪吃蛇同时移动模式"""
+    print("\n=== 测试贪吃蛇同时移动模式 ===")
+    
+    try:
+        import random
+        from games.snake import SnakeGame, SnakeEnv
+        
+        # 两条蛇相向而行，同一tick进入同一格时双方都死亡
+        game = SnakeGame(board_size=7, simultaneous=True)
+        game.food_count = 0
+        for food in list(game.foods):
+            game.foods.remove(food)
+            game._set_cell(food, 0)
+        game._hash = game._compute_hash()
+        game.step(((0, 1), (0, -1)))
+        _, _, done, _ = game.step(((0, 1), (0, -1)))
+        assert done and not game.alive1 and not game.alive2 and game.get_winner() is None
+        print("✓ 头对头碰撞双方同时死亡")
+        
+        random.seed(0)
+        game = SnakeGame(board_size=8, simultaneous=True)
+        start = (game.hash, list(game.snake1), list(game.snake2), list(game.foods))
+        ticks = 0
+        while not game.is_terminal() and ticks < 30:
+            game.apply((random.choice(game.get_valid_actions(1)), random.choice(game.get_valid_actions(2))))
+            assert game.current_player == 1
+            ticks += 1
+        for _ in range(ticks):
+            game.undo()
+        assert (game.hash, list(game.snake1), list(game.snake2), list(game.foods)) == start
+        print("✓ 同时移动可用undo撤销")
+        
+        env = SnakeEnv(board_size=8, simultaneous=True)
+        env.reset()
+        _, _, _, _, info = env.step(((0, 1), (0, -1)))
+        assert 'error' not in info
+        _, reward, done, _, info = env.step(((0, -1), (0, -1)))
+        assert done and info['error'] == 'Invalid action'
+        print("✓ 环境支持同时移动动作")
+        
+        # 通用智能体从联合动作中选择，贪吃蛇专用智能体各自为自己的蛇选方向
+        from agents import RandomBot, SnakeAI, SmartSnakeAI
+        env.reset()
+        assert len(env.get_valid_actions()) == 9 and len(env.get_valid_actions(2)) == 3
+        bot = RandomBot(name="随机Bot", player_id=1)
+        for _ in range(20):
+            if env.is_terminal():
+                break
+            _, reward, done, _, info = env.step(bot.get_action(None, env))
+            assert 'error' not in info
+        env.reset()
+        agents = [SnakeAI(player_id=1), SmartSnakeAI(player_id=2)]
+        for _ in range(20):
+            if env.is_terminal():
+                break
+            _, reward, done, _, info = env.step(tuple(agent.get_action(None, env) for agent in agents))
+            assert 'error' not in info and env.game.current_player == 1
+        print("✓ 同时模式下智能体给出合法动作")
+        
+        # 搜索智能体在联合动作上搜索，只返回己方方向
+        from collections import deque
+        from agents import MCTSBot, MinimaxBot
+        game = SnakeGame(board_size=8, simultaneous=True)
+        start = game.hash
+        assert game.random_playouts(2, seed=0).shape == (2,) and game.hash == start
+        for agents in ([MCTSBot(player_id=1, timeout=None), MinimaxBot(player_id=2, max_depth=2)],
+                       [MinimaxBot(player_id=1, max_depth=2, use_candidates=False),
+                        MCTSBot(player_id=2, timeout=None)]):
+            for agent in agents:
+                if isinstance(agent, MCTSBot):
+                    agent.simulation_count = 30
+            env.reset()
+            for _ in range(10):
+                if env.is_terminal():
+                    break
+                joint = tuple(agent.get_action(None, env) for agent in agents)
+                for player, direction in enumerate(joint, 1):
+                    assert direction in env.get_valid_actions(player)
+                _, reward, done, _, info = env.step(joint)
+                assert 'error' not in info
+        print("✓ 同时模式下搜索智能体只返回己方方向")
+        
+        # 玩家2的蛇在角落，只有向下不会撞墙；MCTS（用领地评估区分胜负）应从玩家2的视角选出这一步
+        game = env.game
+        for food in list(game.foods):
+            game.foods.remove(food)
+            game._set_cell(food, 0)
+        game.food_count = 0
+        for pos in list(game.snake1) + list(game.snake2):
+            game._set_cell(pos, 0)
+        game.snake1 = deque([(4, 4)])
+        game._set_cell((4, 4), 1)
+        game.snake2 = deque([(0, 0)])
+        game._set_cell((0, 0), 3)
+        game.alive1 = game.alive2 = True
+        game.direction1, game.direction2 = (0, 1), (0, -1)
+        game._hash = game._compute_hash()
+        mcts_bot = MCTSBot(player_id=2, timeout=None)
+        mcts_bot.simulation_count = 200
+        mcts_bot.leaf_evaluator = True
+        assert mcts_bot.get_action(None, env) == (1, 0)
+        print("✓ 玩家2的搜索智能体从己方视角评估")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 贪吃蛇同时移动模式测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_batch_snake():
+    """测试批量贪吃蛇模拟器"""
+    print("\n=== 测试批量贪吃蛇模拟器 ===")
+    
+    try:
+        from games.snake import SnakeGame, BatchSnakeGame
+        
+        actions = [tuple(a) for a in BatchSnakeGame.ACTIONS.tolist()]
+        batch = BatchSnakeGame(num_games=20, board_size=8, food_count=0, seed=0, auto_reset=False)
+        games = [SnakeGame(board_size=8, food_count=0, simultaneous=True) for _ in range(20)]
+        while not batch.done.all():
+            joint = batch.random_actions()
+            _, rewards, dones, _ = batch.step(joint)
+            for i, game in enumerate(games):
+                if game.is_terminal():
+                    continue
+                _, reward, done, _ = game.step((actions[joint[i, 0]], actions[joint[i, 1]]))
+                assert (game.board == batch.boards[i]).all()
+                assert (reward, done) == (rewards[i, 0], dones[i])
+        print("✓ 批量模拟结果与逐局同时移动模拟一致")
+        
+        game = SnakeGame(board_size=8)
+        batch = BatchSnakeGame.from_game(game, num_games=10, seed=0)
+        assert (batch.boards == game.board).all()
+        finished = batch.play_random(300)
+        assert finished.sum() > 0 and not batch.done.any()
+        assert ((batch.boards == BatchSnakeGame.FOOD_CELL).sum(axis=(1, 2)) == batch.food_left).all()
+        print("✓ 结束的对局自动重置")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 批量贪吃蛇模拟器测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_snake_distance_field():
+    """测试贪吃蛇距离场"""
+    print("\n=== 测试贪吃蛇距离场 ===")
+    
+    try:
+        from collections import deque
+        from games.snake import SnakeEnv, SnakeGame, get_distance_field
+        from agents import SnakeAI, SmartSnakeAI
+        
+        env = SnakeEnv(board_size=10, simultaneous=True)
+        env.reset()
+        game = env.game
+        field = get_distance_field(game)
+        head = game.snake1[0]
+        nearest = min(abs(head[0] - x) + abs(head[1] - y) for x, y in game.foods)
+        assert field.distance_to_food(1) == nearest
+        dx, dy = field.next_step_to_food(1)
+        assert field.food_distances()[head[0] + dx, head[1] + dy] == nearest - 1
+        assert not field.is_safe((-1, 0)) and not field.is_safe((0, 10))
+        print("✓ 距离场给出最近食物的距离和最短路径方向")
+        
+        # 碰撞按移动前的棋盘判定，蛇尾下一步不安全，之后才能进入
+        tail_game = SnakeGame(board_size=8, food_count=0)
+        for pos in list(tail_game.snake1) + list(tail_game.snake2):
+            tail_game._set_cell(pos, 0)
+        tail_game.snake1 = deque([(0, 1), (1, 1), (1, 0), (0, 0)])
+        for i, pos in enumerate(tail_game.snake1):
+            tail_game._set_cell(pos, 1 if i == 0 else 2)
+        tail_game.snake2 = deque([(7, 7)])
+        tail_game._set_cell((7, 7), 3)
+        tail_game.direction1 = (-1, 0)
+        tail_game._hash = tail_game._compute_hash()
+        tail_field = get_distance_field(tail_game)
+        assert not tail_field.is_safe((0, 0))
+        assert tail_field.safe_actions(1, [(0, -1), (0, 1)]) == [(0, 1)]
+        assert tail_field.distance(1, (0, 0)) != 1 and tail_field.distance(1, (0, 2)) == 1
+        
+        # 蛇身格子相同、蛇尾不同的局面不共用缓存
+        for pos in tail_game.snake1:
+            tail_game._set_cell(pos, 0)
+        tail_game.snake1 = deque([(0, 1), (0, 0), (1, 0), (1, 1)])
+        for i, pos in enumerate(tail_game.snake1):
+            tail_game._set_cell(pos, 1 if i == 0 else 2)
+        tail_game._hash = tail_game._compute_hash()
+        reordered = get_distance_field(tail_game)
+        assert reordered is not tail_field
+        assert reordered.distance(1, (0, 0)) == 5 and tail_field.distance(1, (0, 0)) == 7
+        tail_game.step((0, -1))
+        assert not tail_game.alive1
+        print("✓ 蛇尾下一步不安全，与游戏引擎一致")
+        
+        assert get_distance_field(game) is field
+        game.current_player = 2
+        assert get_distance_field(game) is field
+        game.current_player = 1
+        print("✓ 同一局面的查询共用缓存")
+        
+        agents = [SmartSnakeAI(player_id=1), SnakeAI(player_id=2)]
+        for _ in range(50):
+            if game.is_terminal():
+                break
+            env.step(tuple(agent.get_action(None, env) for agent in agents))
+        print("✓ 贪吃蛇AI使用距离场对战")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 贪吃蛇距离场测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_snake_territory():
+    """测试贪吃蛇领地评估"""
+    print("\n=== 测试贪吃蛇领地评估 ===")
+    
+    try:
+        import numpy as np
+        from collections import deque
+        from games.snake import SnakeGame, flood_fill, evaluate_actions
+        from games.snake.territory import NEVER
+        
+        # 第2列是墙，只有(0, 2)处的蛇身在第5个tick移走
+        times = np.zeros((1, 5, 5), dtype=np.int32)
+        times[0, :, 2] = NEVER
+        times[0, 0, 2] = 5
+        arrival = flood_fill(times, np.array([[[0, 0]]]), np.zeros((1, 1), dtype=np.int64))
+        assert arrival[0, 0, 0, 2] == 5 and arrival[0, 0, 0, 3] == 6
+        assert (arrival >= 0).sum() == 21
+        print("✓ 洪水填充考虑蛇尾移走的时间")
+        
+        times = np.zeros((1, 5, 5), dtype=np.int32)
+        starts = np.array([[[2, 0], [2, 4]]])
+        arrival = flood_fill(times, starts, np.zeros((1, 2), dtype=np.int64))
+        assert (arrival[0, 0] >= 0).sum() == 10 and (arrival[0, 1] >= 0).sum() == 10
+        assert (arrival[0, :, :, 2] < 0).all()
+        print("✓ 同时到达的格子不属于任何一方")
+        
+        game = SnakeGame(board_size=8)
+        scores = evaluate_actions(game, 1, [(-1, 0), (0, 1), (0, -1)])
+        assert (scores['reachable'] > 0).all()
+        assert scores['territory'][2] < scores['territory'][1]
+        print("✓ 一次调用评估所有候选动作")
+        
+        # 蛇头紧挨自己的蛇尾，向右是死胡同；蛇尾要到下一步之后才移走，向左撞蛇尾必死
+        game = SnakeGame(board_size=8, food_count=0)
+        for pos in list(game.snake1) + list(game.snake2):
+            game._set_cell(pos, 0)
+        game.snake1 = deque([(0, 1), (1, 1), (1, 0), (0, 0)])
+        game.snake2 = deque([(0, 3), (1, 3), (1, 2)])
+        for player, snake in ((1, game.snake1), (2, game.snake2)):
+            for i, pos in enumerate(snake):
+                game._set_cell(pos, 2 * player - 1 if i == 0 else 2 * player)
+        game.direction1 = game.direction2 = (-1, 0)
+        game._hash = game._compute_hash()
+        scores = evaluate_actions(game, 1, [(0, -1), (0, 1)])
+        assert scores['reachable'][0] == 0 and scores['territory'][0] == 0
+        assert scores['reachable'][1] > 0
+        game.step((0, -1))
+        assert not game.alive1
+        print("✓ 撞向蛇尾的动作判为非法，与游戏引擎一致")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 贪吃蛇领地评估测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
+def test_snake_arena():
+    """测试多蛇竞技场"""
+    print("\n=== 测试多蛇竞技场 ===")
+    
+    try:
+        from games.snake import SnakeArena
+        
+        arena = SnakeArena(num_snakes=2, board_size=8, food_count=0, seed=0)
+        assert arena.snakes[0][0] == (2, 2) and arena.snakes[1][0] == (2, 4)
+        _, reward, done, info = arena.step([None, None])
+        assert done and info['died'] == [1, 2] and list(reward) == [-1, -1]
+        assert arena.get_winner() is None
+        print("✓ 多个蛇头进入同一格时同时死亡")
+        
+        arena = SnakeArena(num_snakes=32, board_size=200, seed=0)
+        assert arena.alive_count == 32 and len(arena.foods) == 32
+        for _ in range(20):
+            arena.step([None] * 32)
+        assert (arena.board > 0).sum() == sum(len(snake) for snake in arena.snakes)
+        assert len(arena._free) == 200 * 200 - (arena.board != 0).sum()
+        cloned = arena.clone()
+        cloned.step([(1, 0)] * 32)
+        assert cloned.move_count == arena.move_count + 1
+        print("✓ 200x200棋盘上32条蛇同时移动")
+        
+        import random
+        rng = random.Random(0)
+        small = SnakeArena(num_snakes=9, board_size=12, food_count=20, seed=0)
+        snapshots = []
+        while not small.is_terminal():
+            snapshots.append((small.board.copy(), [list(snake) for snake in small.snakes],
+                              list(small.directions), list(small.alive), set(small.foods)))
+            small.apply([rng.choice(small.get_valid_actions(i + 1)) for i in range(9)])
+        assert len(snapshots) > 1 and max(len(snake) for snake in small.snakes) > 1
+        while snapshots:
+            small.undo()
+            board, snakes, directions, alive, foods = snapshots.pop()
+            assert (small.board == board).all() and [list(snake) for snake in small.snakes] == snakes
+            assert small.directions == directions and small.alive == alive and small.foods == foods
+            assert small.alive_count == sum(alive) and small.move_count == len(snapshots)
+            assert len(small._free) == 12 * 12 - (small.board != 0).sum()
+        print("✓ undo逐tick恢复蛇身、方向、存活状态和食物")
+        
+        arena.current_player = 32
+        arena.switch_player()
+        assert arena.current_player == 1
+        arena.switch_player()
+        assert arena.current_player == 2
+        print("✓ 多名玩家按顺序轮转")
+        
+        return True
+        
+    except Exception as e:
+        print(f"✗ 多蛇竞技场测试失败: {e}")
+        traceback.print_exc()
+        return False
+
+
 def run_all_tests():
     """运行所有测试"""
     print("双人游戏AI框架 - 项目测试")
@@ -258,8 +1300,25 @@ def run_all_tests():
     tests = [
         test_imports,
         test_gomoku_game,
+        test_gomoku_winner,
+        test_gomoku_bitboard,
+        test_apply_undo,
+        test_gomoku_candidates,
+        test_clone,
+        test_zobrist_hash,
+        test_batch_gomoku,
+        test_snake_board,
+        test_snake_simultaneous,
+        test_batch_snake,
+        test_snake_distance_field,
+        test_snake_territory,
+        test_snake_arena,
         test_gomoku_env,
         test_agents,
+        test_mcts_tree,
+        test_progressive_widening,
+        test_leaf_evaluator,
+        test_search_timeout,
         test_game_play,
         test_evaluation,
         test_custom_agents